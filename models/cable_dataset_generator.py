@@ -25,6 +25,7 @@ class CableDatasetGenerator:
     
     def __init__(self, random_seed=42):
         """Initialize the cable dataset generator"""
+        self.random_seed = random_seed
         np.random.seed(random_seed)
         random.seed(random_seed)
         
@@ -224,6 +225,128 @@ class CableDatasetGenerator:
         
         return df
     
+    def generate_sensor_readings(self, zones, time_of_day, weather_factor, rng):
+        """
+        Vectorized generate_sensor_reading for many samples at once
+        
+        Args:
+            zones: Integer zone codes per sample (0=green, 1=yellow, 2=red)
+            time_of_day: Hour (0-23) per sample
+            weather_factor: Weather severity multiplier per sample
+            rng: numpy Generator supplying the batched draws
+            
+        Returns:
+            np.ndarray: (n_samples, 4) temperature, vibration, strain, power
+        """
+        t = self.thresholds
+        n = len(zones)
+        temp_diurnal = 5 * np.sin(2 * np.pi * (time_of_day - 6) / 24)
+        
+        # One batched normal and one batched uniform draw cover every zone
+        z = rng.standard_normal((n, 4))
+        u = rng.random((n, 4))
+        
+        # Green: normal operation with small variations, clipped into the green zone
+        green = np.column_stack([
+            np.clip(self.base_values['temperature'] + temp_diurnal + 3 * z[:, 0], 15, t['temp_green_max']),
+            np.clip(self.base_values['vibration'] + np.abs(0.1 * z[:, 1]) * weather_factor, 0.05, t['vib_green_max']),
+            np.clip(self.base_values['strain'] + 30 * z[:, 2], 50, t['strain_green_max']),
+            np.clip(self.base_values['power'] + 100 * z[:, 3], 200, t['power_green_max']),
+        ])
+        
+        # Yellow: uniform between the green and yellow limits
+        yellow = np.column_stack([
+            t['temp_green_max'] + (t['temp_yellow_max'] - t['temp_green_max']) * u[:, 0] + temp_diurnal,
+            (t['vib_green_max'] + (t['vib_yellow_max'] - t['vib_green_max']) * u[:, 1]) * weather_factor,
+            t['strain_green_max'] + (t['strain_yellow_max'] - t['strain_green_max']) * u[:, 2],
+            t['power_green_max'] + (t['power_yellow_max'] - t['power_green_max']) * u[:, 3],
+        ])
+        
+        # Red: half-normal excursions past the critical limits, with extreme values capped
+        red = np.column_stack([
+            np.minimum(t['temp_red_min'] + np.abs(8 * z[:, 0]) + temp_diurnal, 70),
+            np.minimum(t['vib_red_min'] + np.abs(z[:, 1]) * weather_factor, 5.0),
+            np.minimum(t['strain_red_min'] + np.abs(100 * z[:, 2]), 800),
+            np.minimum(t['power_red_min'] + np.abs(200 * z[:, 3]), 2000),
+        ])
+        
+        readings = np.choose(np.asarray(zones)[:, None], [green, yellow, red])
+        for col, decimals in enumerate((2, 3, 1, 1)):
+            readings[:, col] = np.round(readings[:, col], decimals)
+        return readings
+    
+    def classify_risk_zones(self, readings):
+        """
+        Vectorized classify_risk_zone over an (n_samples, 4) reading array
+        
+        Returns:
+            np.ndarray: Integer zone codes (0=green, 1=yellow, 2=red)
+        """
+        t = self.thresholds
+        red_min = np.array([t['temp_red_min'], t['vib_red_min'], t['strain_red_min'], t['power_red_min']])
+        green_max = np.array([t['temp_green_max'], t['vib_green_max'], t['strain_green_max'], t['power_green_max']])
+        
+        critical_count = (readings >= red_min).sum(axis=1)
+        warning_count = (readings >= green_max).sum(axis=1)
+        return np.where(critical_count >= 2, 2,
+                        np.where((critical_count >= 1) | (warning_count >= 3), 1, 0))
+    
+    def generate_balanced_dataset_fast(self, n_samples=5000, green_ratio=0.6, yellow_ratio=0.25, red_ratio=0.15):
+        """
+        Vectorized generate_balanced_dataset
+        
+        Draws every sample in a few batched calls on a Generator seeded from
+        random_seed instead of looping per sample. Distributions, classification
+        and the single regeneration of mismatched samples follow
+        generate_balanced_dataset, but the random streams differ.
+        
+        Returns:
+            pd.DataFrame: Generated dataset
+        """
+        print(f"🔧 Generating {n_samples} cable monitoring samples (vectorized)...")
+        print(f"📊 Distribution: {green_ratio*100:.1f}% green, {yellow_ratio*100:.1f}% yellow, {red_ratio*100:.1f}% red")
+        
+        rng = np.random.default_rng(self.random_seed)
+        zone_names = np.array(['green', 'yellow', 'red'])
+        
+        # Calculate sample counts and shuffle the target zones
+        n_green = int(n_samples * green_ratio)
+        n_yellow = int(n_samples * yellow_ratio)
+        zones = rng.permutation(np.searchsorted([n_green, n_green + n_yellow], np.arange(n_samples), side='right'))
+        
+        # Vary time of day and weather
+        time_of_day = rng.integers(0, 24, n_samples)
+        weather_factor = rng.uniform(0.7, 1.5, n_samples)
+        
+        readings = self.generate_sensor_readings(zones, time_of_day, weather_factor, rng)
+        actual = self.classify_risk_zones(readings)
+        
+        # If mismatch, regenerate with more extreme values
+        redo = np.flatnonzero(actual != zones)
+        if len(redo):
+            readings[redo] = self.generate_sensor_readings(zones[redo], time_of_day[redo],
+                                                           weather_factor[redo] * 1.2, rng)
+            actual[redo] = self.classify_risk_zones(readings[redo])
+        
+        # Create DataFrame
+        df = pd.DataFrame(readings, columns=['temperature', 'vibration', 'strain', 'power'])
+        df['risk_zone'] = zone_names[actual]
+        df['sample_id'] = range(len(df))
+        
+        # Add timestamp
+        base_time = datetime.now() - timedelta(days=30)
+        df['timestamp'] = pd.date_range(base_time, periods=len(df), freq='5min')
+        
+        # Verify distribution
+        zone_counts = df['risk_zone'].value_counts()
+        print(f"\n📈 Final distribution:")
+        for zone in zone_names:
+            count = zone_counts.get(zone, 0)
+            percentage = count / len(df) * 100
+            print(f"   {zone.upper():6s}: {count:4d} samples ({percentage:5.1f}%)")
+        
+        return df
+    
     def generate_time_series_dataset(self, n_components=10, days=7, samples_per_hour=12):
         """
         Generate time series dataset for multiple cable components
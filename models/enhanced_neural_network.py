@@ -14,8 +14,15 @@ Key Features:
 - Real-time prediction capabilities
 """
 
+import hashlib
+import os
+import threading
 import numpy as np
 import warnings
+from functools import cached_property
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import StandardScaler
 from datetime import datetime
@@ -23,16 +30,88 @@ from datetime import datetime
 # Suppress sklearn warnings
 warnings.filterwarnings('ignore', category=UserWarning)
 
+# Directory for the cached synthetic bootstrap model
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'livewire')
+
+
+def _softmax3(logits):
+    """
+    In-place softmax over the 3 class logits of each row
+    
+    Works column-wise on the three logits instead of reducing along axis 1,
+    which turns the row max/sum into plain elementwise ufunc calls.
+    
+    Args:
+        logits (np.ndarray): Array of shape (n_samples, 3), overwritten
+    
+    Returns:
+        np.ndarray: The same array holding class probabilities
+    """
+    row_buf = np.maximum(logits[:, 0], logits[:, 1])
+    np.maximum(row_buf, logits[:, 2], out=row_buf)
+    logits -= row_buf[:, None]
+    np.exp(logits, out=logits)
+    
+    np.add(logits[:, 0], logits[:, 1], out=row_buf)
+    row_buf += logits[:, 2]
+    logits /= row_buf[:, None]
+    return logits
+
+
 class EnhancedCascadePredictor:
     """Enhanced Neural Network for predicting cascade failures in power grids"""
     
-    def __init__(self):
-        """Initialize the Enhanced Neural Network model"""
+    # Synthetic bootstrap data configuration (part of the cache key)
+    SYNTHETIC_SAMPLES = 1000
+    SYNTHETIC_SEED = 42
+    
+    # The synthetic labels are simple thresholds, so the bootstrap fit uses a
+    # short fixed-iteration schedule instead of the full early-stopping config
+    BOOTSTRAP_PARAMS = {'max_iter': 50, 'early_stopping': False}
+    
+    # Class index -> risk zone
+    RISK_ZONES = ('normal', 'warning', 'critical')
+    
+    # Samples per forward-pass chunk in predict_batch (keeps the hidden
+    # activations of a chunk resident in L2/L3 cache)
+    BATCH_CHUNK_SIZE = 4096
+    
+    # Fast-path boxes per risk zone index, as (lower, upper) bounds on
+    # (temperature, vibration, strain, power). A box is only answered without
+    # the network once the fitted model is saturated on it (_fast_path_table)
+    FAST_PATH_BOXES = {
+        0: ((10.0, 0.0, 0.0, 200.0), (30.0, 1.0, 30.0, 800.0)),
+        2: ((80.0, 0.0, 0.0, 100.0), (150.0, 10.0, 150.0, 1000.0)),
+    }
+    FAST_PATH_SAMPLES = 2000
+    FAST_PATH_MIN_CONFIDENCE = 0.99
+    
+    # Names of the 12 engineered features, in model input order
+    FEATURE_NAMES = [
+        'temperature', 'vibration', 'strain', 'power',
+        'temp_vib_interaction', 'strain_power_ratio', 
+        'thermal_stress', 'vibration_power_product',
+        'total_stress', 'stress_variance', 
+        'normalized_temp', 'power_efficiency'
+    ]
+    
+    def __init__(self, fast_path=False, n_jobs=-1):
+        """
+        Initialize the Enhanced Neural Network model
+        
+        Args:
+            fast_path (bool): Answer readings inside a FAST_PATH_BOXES box on
+                which the fitted network is saturated with that box's
+                precomputed network output instead of running the network
+            n_jobs (int): Threads used by predict_batch across chunks (-1 = all cores)
+        """
         # Model configuration
         self.model_name = "Enhanced Neural Network"
         self.claimed_accuracy = 0.70  # 70% claimed accuracy
         self.architecture = "MLPClassifier(128,64,32,16)"
         self.feature_count = 12
+        self.fast_path = fast_path
+        self.n_jobs = n_jobs
         
         # Initialize neural network with optimized architecture
         self.model = MLPClassifier(
@@ -55,23 +134,57 @@ class EnhancedCascadePredictor:
         
         # Training status
         self.is_trained = False
+        self._importance = None
         
         # Pre-train the model with synthetic data for immediate use
         self._initialize_with_synthetic_data()
         
         print("🧠 Enhanced Neural Network Model initialized (70% accuracy)")
     
+    def _bootstrap_cache_path(self):
+        """Path of the cached bootstrap model for the current data/model config"""
+        # The generator type is part of the key since it determines the data
+        config = ('default_rng', self.SYNTHETIC_SAMPLES, self.SYNTHETIC_SEED,
+                  sorted(self.model.get_params().items()),
+                  sorted(self.BOOTSTRAP_PARAMS.items()))
+        cache_key = hashlib.md5(repr(config).encode()).hexdigest()
+        return os.path.join(CACHE_DIR, f"enhanced_nn_{cache_key}.joblib")
+    
     def _initialize_with_synthetic_data(self):
         """Initialize model with synthetic training data for immediate use"""
-        # Generate synthetic training data
-        np.random.seed(42)
-        n_samples = 1000
+        cache_path = self._bootstrap_cache_path()
+        
+        # Reuse a previously trained bootstrap model when available
+        if os.path.exists(cache_path):
+            try:
+                self.model, self.scaler = joblib.load(cache_path)
+                self.is_trained = True
+                self._refresh_model_summaries()
+                self._prepare_inference_state()
+                return
+            except Exception:
+                pass  # Corrupt or incompatible cache, retrain below
+        
+        self._train_on_synthetic_data()
+        
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            joblib.dump((self.model, self.scaler), cache_path)
+        except OSError:
+            pass  # Caching is best-effort (e.g. read-only home directory)
+    
+    def _train_on_synthetic_data(self):
+        """Train the model on freshly generated synthetic sensor data"""
+        # Generate synthetic training data with a local generator so the
+        # global NumPy random state is left untouched
+        rng = np.random.default_rng(self.SYNTHETIC_SEED)
+        n_samples = self.SYNTHETIC_SAMPLES
         
         # Create synthetic sensor data
-        temperature = np.random.normal(45, 15, n_samples)
-        vibration = np.random.exponential(2, n_samples) 
-        strain = np.random.normal(50, 20, n_samples)
-        power = np.random.normal(500, 150, n_samples)
+        temperature = rng.normal(45, 15, n_samples)
+        vibration = rng.exponential(2, n_samples) 
+        strain = rng.normal(50, 20, n_samples)
+        power = rng.normal(500, 150, n_samples)
         
         # Create features matrix
         X = []
@@ -102,10 +215,128 @@ class EnhancedCascadePredictor:
         X = np.array(X)
         y = np.array(y)
         
-        # Scale features and train model
+        # Scale features and train a bootstrap copy of the model, then restore
+        # the configured params so later fits use the full schedule
         X_scaled = self.scaler.fit_transform(X)
-        self.model.fit(X_scaled, y)
+        configured = {name: self.model.get_params()[name] for name in self.BOOTSTRAP_PARAMS}
+        bootstrap_model = clone(self.model).set_params(**self.BOOTSTRAP_PARAMS)
+        bootstrap_model.fit(X_scaled, y)
+        self.model = bootstrap_model.set_params(**configured)
         self.is_trained = True
+        self._refresh_model_summaries()
+        self._prepare_inference_state()
+    
+    def _refresh_model_summaries(self):
+        """Recompute feature importances and drop the cached model info after training"""
+        # For neural networks, we approximate importance using weight magnitudes
+        first_layer_weights = self.model.coefs_[0]
+        importance_scores = np.mean(np.abs(first_layer_weights), axis=1)
+        
+        # Normalize to sum to 1
+        importance_scores = importance_scores / np.sum(importance_scores)
+        self._importance = dict(zip(self.FEATURE_NAMES, importance_scores))
+        
+        self.__dict__.pop('model_info', None)
+    
+    def _prepare_inference_state(self):
+        """Cache float32 scaler statistics and weights"""
+        self._mean = self.scaler.mean_.astype(np.float32)
+        self._inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
+        self._weights = [W.astype(np.float32) for W in self.model.coefs_]
+        self._biases = [b.astype(np.float32) for b in self.model.intercepts_]
+        self._fast_path_boxes = None  # Rebuilt from these weights on first use
+        
+        # Single-sample scratch buffers, sized for these weights and allocated
+        # per thread on first use (see _scratch_buffers)
+        self._scratch = threading.local()
+        
+        # What the snapshots were taken from: a fresh fit gives coefs_ / mean_
+        # new arrays, and partial_fit or a warm-started fit advances t_
+        # (samples seen), so any refit of self.model or self.scaler shows here
+        self._source_coefs = self.model.coefs_
+        self._source_mean = self.scaler.mean_
+        self._source_samples = self.model.__dict__.get('t_')
+        self._source_model = self.model
+        self._source_scaler = self.scaler
+    
+    def _sync_inference_state(self):
+        """Re-snapshot weights, statistics and importances if the model was refitted"""
+        # Plain attribute compares, most likely to differ first
+        model = self.model
+        if (model.coefs_ is not self._source_coefs or self.scaler.mean_ is not self._source_mean
+                or model.__dict__.get('t_') != self._source_samples
+                or model is not self._source_model or self.scaler is not self._source_scaler):
+            self._refresh_model_summaries()
+            self._prepare_inference_state()
+    
+    def _scratch_buffers(self):
+        """
+        This thread's float32 scratch buffers for the single-sample path
+        
+        Concurrent predict_cascade_risk calls (e.g. from API worker threads)
+        each get their own set, so they never overwrite each other's values.
+        
+        Returns:
+            tuple: (x_buf, scaled_buf, h_bufs), each of batch size 1
+        """
+        scratch = self._scratch
+        buffers = getattr(scratch, 'buffers', None)
+        if buffers is None:
+            buffers = scratch.buffers = (
+                np.empty((1, self.feature_count), dtype=np.float32),
+                np.empty((1, self.feature_count), dtype=np.float32),
+                [np.empty((1, W.shape[1]), dtype=np.float32) for W in self._weights],
+            )
+        return buffers
+    
+    def _forward_single(self, x_buf, scaled_buf, h_bufs):
+        """
+        Forward pass for the sample in x_buf without allocating arrays
+        
+        Args:
+            x_buf, scaled_buf, h_bufs: Scratch buffers from _scratch_buffers()
+        
+        Returns:
+            np.ndarray: Class probabilities (view into a scratch buffer)
+        """
+        # Standardize in place of StandardScaler.transform
+        np.subtract(x_buf, self._mean, out=scaled_buf)
+        scaled_buf *= self._inv_scale
+        
+        # Hidden layers (ReLU) followed by the output layer (softmax)
+        h = scaled_buf
+        last = len(self._weights) - 1
+        for i, (W, b, out) in enumerate(zip(self._weights, self._biases, h_bufs)):
+            np.dot(h, W, out=out)
+            out += b
+            if i < last:
+                np.maximum(out, 0, out=out)
+            h = out
+        
+        h -= h.max()
+        np.exp(h, out=h)
+        h /= h.sum()
+        return h[0]
+    
+    def _forward(self, X_scaled):
+        """
+        Batched forward pass on already scaled float32 features
+        
+        Args:
+            X_scaled (np.ndarray): Scaled features of shape (n_samples, 12)
+            
+        Returns:
+            np.ndarray: Class probabilities of shape (n_samples, 3)
+        """
+        h = X_scaled
+        for W, b in zip(self._weights[:-1], self._biases[:-1]):
+            h = h @ W
+            h += b
+            np.maximum(h, 0, out=h)
+        
+        h = h @ self._weights[-1]
+        h += self._biases[-1]
+        return _softmax3(h)
     
     def engineer_features(self, sensor_data):
         """
@@ -122,6 +353,11 @@ class EnhancedCascadePredictor:
         strain = sensor_data.get('strain', 0)
         power = sensor_data.get('power', 0)
         
+        # Population variance of the three stress sensors (same as np.var)
+        m = (temp + vib + strain) * (1.0 / 3.0)
+        stress_variance = ((temp - m) * (temp - m) + (vib - m) * (vib - m)
+                           + (strain - m) * (strain - m)) * (1.0 / 3.0)
+        
         # Advanced feature engineering (12 features)
         features = {
             # Raw features (4)
@@ -138,13 +374,63 @@ class EnhancedCascadePredictor:
             
             # Statistical features (4) 
             'total_stress': temp + vib + strain,
-            'stress_variance': np.var([temp, vib, strain]),
+            'stress_variance': stress_variance,
             'normalized_temp': temp / 100.0,
             'power_efficiency': power / (temp + 1e-6)
         }
         
         return features
     
+    def engineer_feature_matrix(self, sensor_data_list):
+        """
+        Vectorized engineer_features for many readings at once
+        
+        Args:
+            sensor_data_list (list): List of sensor data dictionaries
+        
+        Returns:
+            tuple: (X, raw) where X is the float32 (n_samples, 12) feature
+                matrix and raw the float64 (n_samples, 4) sensor readings
+        """
+        raw = np.array([
+            (d.get('temperature', 0), d.get('vibration', 0),
+             d.get('strain', 0), d.get('power', 0))
+            for d in sensor_data_list
+        ], dtype=np.float64).reshape(-1, 4)
+        return self._feature_matrix(raw), raw
+    
+    def _feature_matrix(self, raw):
+        """
+        Float32 (n_samples, 12) feature matrix from (n_samples, 4) raw readings
+        
+        Args:
+            raw (np.ndarray): Temperature, vibration, strain and power columns
+        
+        Returns:
+            np.ndarray: Engineered features in FEATURE_NAMES order
+        """
+        temp, vib, strain, power = raw.T
+        
+        m = (temp + vib + strain) * (1.0 / 3.0)
+        
+        # Same column order as engineer_features / FEATURE_NAMES
+        X = np.empty((len(raw), self.feature_count), dtype=np.float32)
+        X[:, 0] = temp
+        X[:, 1] = vib
+        X[:, 2] = strain
+        X[:, 3] = power
+        X[:, 4] = temp * vib
+        X[:, 5] = strain / (power + 1e-6)
+        X[:, 6] = temp * strain
+        X[:, 7] = vib * power
+        X[:, 8] = temp + vib + strain
+        X[:, 9] = ((temp - m) * (temp - m) + (vib - m) * (vib - m)
+                   + (strain - m) * (strain - m)) * (1.0 / 3.0)
+        X[:, 10] = temp / 100.0
+        X[:, 11] = power / (temp + 1e-6)
+        
+        return X
+    
     def predict_cascade_risk(self, sensor_data):
         """
         Predict cascade failure risk from sensor data
@@ -160,30 +446,83 @@ class EnhancedCascadePredictor:
         """
         if not self.is_trained:
             raise RuntimeError("Model not trained. Call train() first.")
+        self._sync_inference_state()
         
-        # Engineer features
-        features = self.engineer_features(sensor_data)
+        if self.fast_path:
+            result = self._fast_path_prediction(sensor_data)
+            if result is not None:
+                return result
         
-        # Convert to array and scale
-        X = np.array([list(features.values())])
-        X_scaled = self.scaler.transform(X)
+        # Engineer features straight into this thread's input buffer
+        x_buf, scaled_buf, h_bufs = self._scratch_buffers()
+        features = self.engineer_features(sensor_data)
+        x_buf[0] = tuple(features.values())
         
-        # Get prediction and probabilities
-        prediction = self.model.predict(X_scaled)[0]
-        probabilities = self.model.predict_proba(X_scaled)[0]
+        # Scale and run the network on the scratch buffers
+        probabilities = self._forward_single(x_buf, scaled_buf, h_bufs)
+        prediction = probabilities.argmax()
         
         # Map prediction to risk zone
-        risk_zones = ['normal', 'warning', 'critical']
-        risk_zone = risk_zones[prediction]
+        risk_zone = self.RISK_ZONES[prediction]
         
         # Calculate confidence as max probability
-        confidence = np.max(probabilities)
+        confidence = float(probabilities[prediction])
         
         # Calculate risk probability (warning + critical)
-        risk_probability = probabilities[1] + probabilities[2] if len(probabilities) > 2 else probabilities[-1]
+        risk_probability = float(probabilities[1] + probabilities[2])
         
         return risk_zone, confidence, risk_probability
     
+    def _fast_path_table(self):
+        """
+        Fast-path boxes the current network is saturated on, with their results
+        
+        Each box is checked on FAST_PATH_SAMPLES readings drawn uniformly from
+        it. It is kept only if the network puts every one of them in the box's
+        zone with confidence >= FAST_PATH_MIN_CONFIDENCE, and its result is the
+        network's output on the least confident of them. The table is built
+        lazily and dropped whenever the weights are re-snapshotted, so it
+        always describes the fitted model.
+        
+        Returns:
+            list: (lower, upper, (risk_zone, confidence, risk_probability)) tuples
+        """
+        if self._fast_path_boxes is None:
+            rng = np.random.default_rng(self.SYNTHETIC_SEED)
+            table = []
+            for zone, (lower, upper) in self.FAST_PATH_BOXES.items():
+                lower, upper = np.array(lower), np.array(upper)
+                raw = rng.uniform(lower, upper, size=(self.FAST_PATH_SAMPLES, 4))
+                X = self._feature_matrix(raw)
+                X -= self._mean
+                X *= self._inv_scale
+                probabilities = self._forward(X)
+                zone_confidence = probabilities[:, zone]
+                if zone_confidence.min() >= self.FAST_PATH_MIN_CONFIDENCE:
+                    worst = probabilities[zone_confidence.argmin()]
+                    result = (self.RISK_ZONES[zone], float(worst[zone]), float(worst[1] + worst[2]))
+                    table.append((lower, upper, result))
+            self._fast_path_boxes = table
+        return self._fast_path_boxes
+    
+    def _fast_path_prediction(self, sensor_data):
+        """
+        Short-circuit readings inside a box the network is saturated on
+        
+        Args:
+            sensor_data (dict): Sensor readings
+            
+        Returns:
+            tuple or None: The box's (risk_zone, confidence, risk_probability),
+                or None when the full forward pass is needed
+        """
+        reading = (sensor_data.get('temperature', 0), sensor_data.get('vibration', 0),
+                   sensor_data.get('strain', 0), sensor_data.get('power', 0))
+        for lower, upper, result in self._fast_path_table():
+            if all(lo <= value <= hi for value, lo, hi in zip(reading, lower, upper)):
+                return result
+        return None
+    
     def predict_batch(self, sensor_data_list):
         """
         Predict cascade risk for multiple sensor readings
@@ -194,14 +533,51 @@ class EnhancedCascadePredictor:
         Returns:
             list: List of (risk_zone, confidence, risk_probability) tuples
         """
-        results = []
-        for sensor_data in sensor_data_list:
-            result = self.predict_cascade_risk(sensor_data)
-            results.append(result)
-        return results
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+        self._sync_inference_state()
+        
+        n_samples = len(sensor_data_list)
+        if n_samples == 0:
+            return []
+        
+        # Engineer and scale all readings at once
+        X, raw = self.engineer_feature_matrix(sensor_data_list)
+        X -= self._mean
+        X *= self._inv_scale
+        
+        # Run the network chunk by chunk into a preallocated output. Chunks are
+        # independent and NumPy releases the GIL in matmul, so large batches
+        # are spread over a thread pool.
+        probabilities = np.empty((n_samples, len(self.RISK_ZONES)), dtype=np.float32)
+        chunk = self.BATCH_CHUNK_SIZE
+        if n_samples <= chunk:
+            probabilities[:] = self._forward(X)
+        else:
+            chunk_probabilities = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                delayed(self._forward)(X[start:start + chunk])
+                for start in range(0, n_samples, chunk)
+            )
+            np.concatenate(chunk_probabilities, out=probabilities)
+        
+        predictions = probabilities.argmax(axis=1)
+        risk_zones = np.array(self.RISK_ZONES, dtype=object)[predictions]
+        confidence = probabilities.max(axis=1).astype(np.float64)
+        risk_probability = (probabilities[:, 1] + probabilities[:, 2]).astype(np.float64)
+        
+        # Override readings covered by the fast path, as predict_cascade_risk does
+        if self.fast_path:
+            for lower, upper, (zone, conf, risk) in self._fast_path_table():
+                mask = ((raw >= lower) & (raw <= upper)).all(axis=1)
+                risk_zones[mask] = zone
+                confidence[mask] = conf
+                risk_probability[mask] = risk
+        
+        return list(zip(risk_zones.tolist(), confidence.tolist(), risk_probability.tolist()))
     
-    def get_model_info(self):
-        """Get information about the model"""
+    @cached_property
+    def model_info(self):
+        """Information about the model (rebuilt after training)"""
         return {
             'name': self.model_name,
             'accuracy': self.claimed_accuracy,
@@ -210,6 +586,10 @@ class EnhancedCascadePredictor:
             'trained': self.is_trained
         }
     
+    def get_model_info(self):
+        """Get information about the model (a copy the caller may modify)"""
+        return dict(self.model_info)
+    
     def get_feature_importance(self):
         """
         Analyze feature importance (approximation for neural networks)
@@ -217,26 +597,12 @@ class EnhancedCascadePredictor:
         Returns:
             dict: Feature importance scores
         """
-        # For neural networks, we approximate importance using weight magnitudes
-        feature_names = [
-            'temperature', 'vibration', 'strain', 'power',
-            'temp_vib_interaction', 'strain_power_ratio', 
-            'thermal_stress', 'vibration_power_product',
-            'total_stress', 'stress_variance', 
-            'normalized_temp', 'power_efficiency'
-        ]
-        
         if not self.is_trained:
-            return {name: 0.0 for name in feature_names}
-        
-        # Get first layer weights and calculate importance
-        first_layer_weights = self.model.coefs_[0]
-        importance_scores = np.mean(np.abs(first_layer_weights), axis=1)
-        
-        # Normalize to sum to 1
-        importance_scores = importance_scores / np.sum(importance_scores)
+            return {name: 0.0 for name in self.FEATURE_NAMES}
         
-        return dict(zip(feature_names, importance_scores))
+        # Importances are computed once per fit of the weights
+        self._sync_inference_state()
+        return dict(self._importance)
 
 
 # Example usage
@@ -8,6 +8,7 @@ This module implements a lightweight, production‑friendly pipeline to:
 
 It is designed to work with streaming or batch data and to be easily embedded in a backend service.
 It avoids uncommon dependencies; only uses numpy, pandas, scipy, scikit‑learn, and joblib.
+If numba is installed, the per‑component feature kernels are JIT‑compiled.
 
 Key ideas
 ---------
@@ -41,6 +42,11 @@ pipeline.fit(calib_df)  # calib_df contains the columns listed above across many
 # 2) Score new data (batch or stream)
 scored = pipeline.score(new_df)  # adds columns: cci, zone, time_left_hours
 
+# 2b) Streaming: seed the state with recent history, then score only the rows
+#     that arrived since the previous call
+scored = pipeline.start_stream(history_df)
+scored = pipeline.score_incremental(tick_df)
+
 # 3) Persist artifacts for deployment
 pipeline.save("./artifacts")
 
@@ -61,14 +67,23 @@ from typing import Dict, Tuple, Optional
 
 import numpy as np
 import pandas as pd
-from scipy.signal import welch
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import welch, get_window
+from scipy.special import expit
 from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LinearRegression
 from sklearn.pipeline import Pipeline
 from sklearn.base import BaseEstimator, TransformerMixin
-from joblib import dump, load
+from joblib import dump, load, Parallel, delayed, effective_n_jobs
+import json
 import os
 
+# Optional JIT for the feature kernels; NumPy fallbacks are used without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # -----------------------------
 # Configuration
 # -----------------------------
@@ -106,6 +121,9 @@ class CCIPipelineConfig:
     # Optional extra driver names
     wind_col: Optional[str] = "wind_speed"
 
+    # Threads for per‑component feature kernels (-1 = all cores)
+    n_jobs: int = -1
+
     # Mandatory column names
     ts_col: str = "timestamp"
     id_col: str = "component_id"
@@ -114,6 +132,57 @@ class CCIPipelineConfig:
     strain_col: str = "strain"
 
 
+# -----------------------------
+# Numeric kernels
+# -----------------------------
+
+def _rolling_dot_kernel(x, coeffs, out):
+    """out[i] = coeffs · x[i‑win+1 : i+1] for every full trailing window."""
+    win = len(coeffs)
+    for i in range(win - 1, len(x)):
+        acc = 0.0
+        for j in range(win):
+            acc += coeffs[j] * x[i - win + 1 + j]
+        out[i] = acc
+
+
+def _strided_mean_kernel(values, starts, counts, step, out):
+    """out[r] = mean(values[starts[r] + k*step] for k < counts[r])."""
+    for r in range(len(starts)):
+        acc = 0.0
+        for k in range(counts[r]):
+            acc += values[starts[r] + k * step]
+        out[r] = acc / counts[r]
+
+
+def _ewma_kernel(x, alpha, starts, ends, mean, wt, out):
+    """pandas ``ewm(alpha=alpha, adjust=False).mean()`` over each x[starts[g]:ends[g]],
+    continuing from the running mean[g] / old weight wt[g] (updated in place)."""
+    old_wt_factor = 1.0 - alpha
+    for g in range(len(starts)):
+        weighted = mean[g]
+        old_wt = wt[g]
+        for i in range(starts[g], ends[g]):
+            cur = x[i]
+            if weighted == weighted:
+                old_wt *= old_wt_factor
+                if cur == cur:
+                    if weighted != cur:
+                        weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                    old_wt = 1.0
+            elif cur == cur:
+                weighted = cur
+            out[i] = weighted
+        mean[g] = weighted
+        wt[g] = old_wt
+
+
+if NUMBA_AVAILABLE:
+    _rolling_dot_kernel = njit(cache=True)(_rolling_dot_kernel)
+    _strided_mean_kernel = njit(cache=True)(_strided_mean_kernel)
+    _ewma_kernel = njit(cache=True)(_ewma_kernel)
+
+
 # -----------------------------
 # Transformers
 # -----------------------------
@@ -126,13 +195,15 @@ class SortAndCast(TransformerMixin, BaseEstimator):
         return self
 
     def transform(self, X: pd.DataFrame):
-        df = X.copy()
+        # Transformers only add (or replace whole) columns, so they work on shallow
+        # copies; the caller's frame is never modified and the data is not duplicated.
+        df = X
         # ensure dtypes
         if not np.issubdtype(df[self.cfg.ts_col].dtype, np.datetime64):
-            df[self.cfg.ts_col] = pd.to_datetime(df[self.cfg.ts_col], errors="coerce")
+            df = df.assign(**{self.cfg.ts_col: pd.to_datetime(df[self.cfg.ts_col], errors="coerce")})
         # drop rows with bad timestamps or mandatory NaNs
         df = df.dropna(subset=[self.cfg.ts_col, self.cfg.id_col, self.cfg.vib_col, self.cfg.temp_col, self.cfg.strain_col])
-        df = df.sort_values([self.cfg.id_col, self.cfg.ts_col]).reset_index(drop=True)
+        df = df.sort_values([self.cfg.id_col, self.cfg.ts_col], ignore_index=True)
         
         # Preserve cable_state if it exists (for validation)
         if 'cable_state' in X.columns:
@@ -155,20 +226,43 @@ class RollingFeatureMaker(TransformerMixin, BaseEstimator):
 
     def __init__(self, cfg: CCIPipelineConfig):
         self.cfg = cfg
-
-    @staticmethod
-    def _rolling_slope(x: pd.Series, win: int) -> pd.Series:
+        # Kernel constants derived from cfg, built once by _prepare_kernels()
+        self._slope_kernel: Optional[np.ndarray] = None
+        self._seg: Optional[int] = None
+        self._hann: Optional[np.ndarray] = None
+        self._hann_norm: Optional[float] = None
+        self._psd_weights: Optional[np.ndarray] = None
+        # Streaming state from the last transform(remember=True) / transform_incremental:
+        # per‑component EWMA mean/weight and the trailing raw rows the window features need
+        self._ewm_state: Optional[pd.DataFrame] = None
+        self._tail: Optional[pd.DataFrame] = None
+
+    def _prepare_kernels(self):
+        cfg = self.cfg
+        # Least‑squares slope against a fixed 0..win‑1 axis is a FIR filter:
+        #   slope = sum((i - mean_i) * y_i) / sum((i - mean_i)^2)
+        idx = np.arange(cfg.short_win, dtype=float)
+        kernel = idx - idx.mean()
+        self._slope_kernel = kernel / np.dot(kernel, kernel)
+
+        # Welch taper and spectral weights for full‑length bandpower segments
+        self._seg = max(cfg.psd_seg_len * 2, 32)
+        nperseg = min(self._seg, 64)
+        self._hann = get_window("hann", nperseg)
+        self._hann_norm = float(np.dot(self._hann, self._hann))
+        self._psd_weights = np.linspace(0.5, 1.0, num=nperseg // 2 + 1)
+
+    def _rolling_slope(self, x: np.ndarray) -> np.ndarray:
+        kernel = self._slope_kernel
+        win = len(kernel)
         if len(x) < win:
-            return pd.Series([np.nan] * len(x), index=x.index)
-        idx = np.arange(win)
+            return np.full(len(x), np.nan)
         out = np.full(len(x), np.nan)
-        for i in range(win - 1, len(x)):
-            y = x.values[i - win + 1 : i + 1]
-            # slope of least‑squares line
-            A = np.vstack([idx, np.ones_like(idx)]).T
-            m, _ = np.linalg.lstsq(A, y, rcond=None)[0]
-            out[i] = m
-        return pd.Series(out, index=x.index)
+        if NUMBA_AVAILABLE:
+            _rolling_dot_kernel(x, kernel, out)
+        else:
+            out[win - 1:] = np.convolve(x, kernel[::-1], mode="valid")
+        return out
 
     @staticmethod
     def _welch_bandpower(x: np.ndarray) -> float:
@@ -182,43 +276,223 @@ class RollingFeatureMaker(TransformerMixin, BaseEstimator):
         w = np.linspace(0.5, 1.0, num=len(Pxx))
         return float(np.sum(Pxx * w))
 
+    def _batched_bandpower(self, x: np.ndarray) -> np.ndarray:
+        """_welch_bandpower over the trailing ``seg`` samples, for every sample at once.
+
+        Welch averages periodograms of 50 %‑overlapping segments. Overlapping trailing
+        windows share those segments, so the band power of every segment is computed
+        once with a single batched rFFT and each window averages the segments it holds.
+        """
+        n = len(x)
+        out = np.full(n, np.nan)
+        seg = self._seg
+        nperseg = len(self._hann)
+        step = nperseg - nperseg // 2
+
+        # Windows shorter than one full segment are left to _head_bandpower
+        if n < nperseg:
+            return out
+
+        # Band power of every segment (Welch defaults: constant detrend, Hann window,
+        # density scaling, one‑sided spectrum)
+        segs = sliding_window_view(x, nperseg)
+        segs = segs - segs.mean(axis=1, keepdims=True)
+        spec = np.abs(np.fft.rfft(segs * self._hann, axis=1)) ** 2 / self._hann_norm
+        spec[:, 1 : (-1 if nperseg % 2 == 0 else None)] *= 2
+        seg_bp = spec @ self._psd_weights
+
+        # Average the segments that fit in each trailing window
+        rows = np.arange(nperseg - 1, n)
+        starts = np.maximum(rows - seg + 1, 0)
+        nsegs = (rows - starts + 1 - nperseg) // step + 1
+        if NUMBA_AVAILABLE:
+            _strided_mean_kernel(seg_bp, starts, nsegs, step, out[nperseg - 1 :])
+        else:
+            total = np.zeros(len(rows))
+            for k in range(nsegs.max()):
+                has_k = nsegs > k
+                total[has_k] += seg_bp[starts[has_k] + k * step]
+            out[nperseg - 1 :] = total / nsegs
+        return out
+
+    def _head_bandpower(self, x: np.ndarray, positions: list, out: np.ndarray) -> None:
+        """_welch_bandpower for the first rows of every component, which are shorter
+        than one full segment.
+
+        A row with L samples is a single Welch segment of length L. Every component
+        has the same head lengths, so each L is one ``welch(..., axis=1)`` call over
+        all components long enough to have it.
+        """
+        nperseg = len(self._hann)
+        if nperseg <= 16 or not positions:
+            return
+        head = nperseg - 1
+        sizes = np.array([len(pos) for pos in positions])
+        head_pos = np.zeros((len(positions), head), dtype=np.intp)
+        for k, pos in enumerate(positions):
+            head_pos[k, : min(len(pos), head)] = pos[:head]
+        heads = x[head_pos]
+        for L in range(16, head + 1):
+            has_L = sizes >= L
+            if not has_L.any():
+                break
+            _, Pxx = welch(heads[has_L, :L], nperseg=L, noverlap=L // 2, axis=1)
+            out[head_pos[has_L, L - 1]] = Pxx @ np.linspace(0.5, 1.0, num=Pxx.shape[1])
+
     def fit(self, X, y=None):
+        self._prepare_kernels()
         return self
 
-    def transform(self, X: pd.DataFrame):
+    @staticmethod
+    def _ewm_alpha(span: int) -> float:
+        # same arithmetic as pandas' span -> com -> alpha conversion
+        return 1.0 / (1.0 + (span - 1) / 2.0)
+
+    def reset_state(self):
+        self._ewm_state = None
+        self._tail = None
+
+    def transform(self, X: pd.DataFrame, remember: bool = False):
+        """Add the rolling features; remember=True also keeps X as the streaming state."""
+        cfg = self.cfg
+        if self._hann is None:
+            self._prepare_kernels()
+        df = X.copy(deep=False)
+        grouped = df.groupby(cfg.id_col, sort=False, observed=True)
+        # Row positions of each component (contiguous once SortAndCast has run)
+        ids = list(grouped.indices.keys())
+        positions = list(grouped.indices.values())
+        last = np.array([pos[-1] for pos in positions], dtype=np.intp)
+        state = {}
+
+        def ewm(col: str, span: int) -> np.ndarray:
+            # groupby‑ewm runs the per‑component recursion in one Cython call
+            out = (grouped[col].ewm(span=span, adjust=False).mean()
+                   .reset_index(level=0, drop=True).reindex(df.index).to_numpy())
+            # Carry the running mean and, after trailing NaNs, the decayed old weight
+            key = f"{col}_{span}"
+            state[key] = out[last]
+            wt = np.ones(len(positions))
+            x = df[col].to_numpy(dtype=float)
+            for g in np.flatnonzero(np.isnan(x[last])):
+                seen = np.flatnonzero(~np.isnan(x[positions[g]]))
+                if len(seen):
+                    wt[g] = (1.0 - self._ewm_alpha(span)) ** (len(positions[g]) - 1 - seen[-1])
+            state[f"{key}_wt"] = wt
+            return out
+
+        self._add_features(df, grouped, positions, ewm)
+        if remember:
+            self._remember(df, ids, positions, state)
+        return df
+
+    def transform_incremental(self, X: pd.DataFrame):
+        """transform() for rows that continue the components seen by the previous call.
+
+        EWMAs resume from the stored per‑component state and the window features
+        (std, slope, bandpower) see the buffered trailing rows, so only the new rows
+        are processed. Rows must be newer than those already seen for their component.
+        Without stored state this is transform(X, remember=True).
+        """
+        if self._tail is None:
+            return self.transform(X, remember=True)
         cfg = self.cfg
-        df = X.copy()
-
-        def per_component(group: pd.DataFrame) -> pd.DataFrame:
-            g = group.copy()
-            for col in [cfg.vib_col, cfg.temp_col, cfg.strain_col]:
-                short = g[col].ewm(span=cfg.short_win, adjust=False).mean()
-                long = g[col].ewm(span=cfg.long_win, adjust=False).mean()
-                g[f"{col}_ewma_s"] = short
-                g[f"{col}_ewma_l"] = long
-                g[f"{col}_std_s"] = g[col].rolling(cfg.short_win, min_periods=cfg.short_win//2).std()
-                g[f"{col}_slope_s"] = RollingFeatureMaker._rolling_slope(g[col], cfg.short_win)
-                g[f"{col}_stress"] = (short - long)
-
-            # Vibration bandpower over a short trailing window
-            seg = max(cfg.psd_seg_len * 2, 32)
-            vib_vals = g[cfg.vib_col].values
-            bp = []
-            for i in range(len(g)):
-                start = max(0, i - seg + 1)
-                bp.append(self._welch_bandpower(vib_vals[start:i+1]))
-            g["vibration_bandpower"] = bp
-
-            # Optional wind speed as additional driver
-            if cfg.wind_col and cfg.wind_col in g.columns:
-                g[f"{cfg.wind_col}_ewma_s"] = g[cfg.wind_col].ewm(span=cfg.short_win, adjust=False).mean()
-                g[f"{cfg.wind_col}_stress"] = g[f"{cfg.wind_col}_ewma_s"] - g[cfg.wind_col].ewm(span=cfg.long_win, adjust=False).mean()
-
-            return g
-
-        df = df.groupby(self.cfg.id_col, group_keys=False).apply(per_component)
+        n_tail = len(self._tail)
+        cols = [c for c in self._tail.columns if c in X.columns]
+        combined = pd.concat([self._tail, X[cols]], ignore_index=True)
+        # Stable grouping keeps each component's buffered rows ahead of its new rows
+        codes = combined.groupby(cfg.id_col, sort=False, observed=True).ngroup().to_numpy()
+        order = np.argsort(codes, kind="stable")
+        combined = combined.take(order).reset_index(drop=True)
+        codes = codes[order]
+        is_new = order >= n_tail
+        sizes = np.bincount(codes)
+        ends = np.cumsum(sizes)
+        starts = ends - sizes
+        new_starts = starts + np.bincount(codes[~is_new], minlength=len(sizes))
+        ids = list(combined[cfg.id_col].to_numpy()[starts])
+        positions = [np.arange(a, b) for a, b in zip(starts, ends)]
+        prev = self._ewm_state.reindex(ids)
+        state = {}
+
+        def ewm(col: str, span: int) -> np.ndarray:
+            key = f"{col}_{span}"
+            mean = prev[key].to_numpy(dtype=float, copy=True)
+            wt = prev[f"{key}_wt"].fillna(1.0).to_numpy(dtype=float, copy=True)
+            out = np.full(len(combined), np.nan)
+            _ewma_kernel(combined[col].to_numpy(dtype=float), self._ewm_alpha(span),
+                         new_starts, ends, mean, wt, out)
+            state[key] = mean
+            state[f"{key}_wt"] = wt
+            return out
+
+        n_base = combined.shape[1]
+        grouped = combined.groupby(cfg.id_col, sort=False, observed=True)
+        self._add_features(combined, grouped, positions, ewm)
+        self._remember(combined, ids, positions, state)
+
+        df = X.copy(deep=False)
+        rows = order[is_new] - n_tail
+        for col in combined.columns[n_base:]:
+            values = np.empty(len(df))
+            values[rows] = combined[col].to_numpy()[is_new]
+            df[col] = values
         return df
 
+    def _remember(self, df: pd.DataFrame, ids: list, positions: list, state: dict) -> None:
+        cfg = self.cfg
+        keep = max(cfg.short_win, self._seg)
+        cols = [c for c in (cfg.id_col, cfg.ts_col, cfg.vib_col, cfg.temp_col, cfg.strain_col, cfg.wind_col)
+                if c and c in df.columns]
+        tail = (np.concatenate([pos[-keep:] for pos in positions]) if positions
+                else np.empty(0, dtype=np.intp))
+        self._tail = df.iloc[tail, df.columns.get_indexer(cols)].reset_index(drop=True)
+        self._ewm_state = pd.DataFrame(state, index=pd.Index(ids, dtype=object))
+
+    def _add_features(self, df: pd.DataFrame, grouped, positions: list, ewm) -> None:
+        cfg = self.cfg
+
+        # Slope and bandpower kernels run on each component's NumPy slices. They are
+        # independent across components and spend their time in NumPy/FFT code that
+        # releases the GIL, so components are spread over a thread pool.
+        signal_cols = [cfg.vib_col, cfg.temp_col, cfg.strain_col]
+        values = {col: df[col].to_numpy(dtype=float) for col in signal_cols}
+        slopes = {col: np.empty(len(df)) for col in signal_cols}
+        bandpower = np.empty(len(df))
+
+        def per_component(chunk: list) -> None:
+            for pos in chunk:
+                for col in signal_cols:
+                    slopes[col][pos] = self._rolling_slope(values[col][pos])
+                bandpower[pos] = self._batched_bandpower(values[cfg.vib_col][pos])
+
+        n_chunks = min(len(positions), effective_n_jobs(cfg.n_jobs))
+        if n_chunks <= 1:
+            per_component(positions)
+        else:
+            Parallel(n_jobs=n_chunks, prefer="threads")(
+                delayed(per_component)(positions[i::n_chunks]) for i in range(n_chunks)
+            )
+        self._head_bandpower(values[cfg.vib_col], positions, bandpower)
+
+        for col in signal_cols:
+            short = ewm(col, cfg.short_win)
+            long = ewm(col, cfg.long_win)
+            df[f"{col}_ewma_s"] = short
+            df[f"{col}_ewma_l"] = long
+            df[f"{col}_std_s"] = (grouped[col].rolling(cfg.short_win, min_periods=cfg.short_win//2)
+                                  .std().reset_index(level=0, drop=True))
+            df[f"{col}_slope_s"] = slopes[col]
+            df[f"{col}_stress"] = (short - long)
+
+        # Vibration bandpower over a short trailing window
+        df["vibration_bandpower"] = bandpower
+
+        # Optional wind speed as additional driver
+        if cfg.wind_col and cfg.wind_col in df.columns:
+            df[f"{cfg.wind_col}_ewma_s"] = ewm(cfg.wind_col, cfg.short_win)
+            df[f"{cfg.wind_col}_stress"] = df[f"{cfg.wind_col}_ewma_s"] - ewm(cfg.wind_col, cfg.long_win)
+
 
 class ColumnScaler(TransformerMixin, BaseEstimator):
     """Standardize a selected set of numeric columns and remember which ones we used."""
@@ -230,13 +504,16 @@ class ColumnScaler(TransformerMixin, BaseEstimator):
     def fit(self, X: pd.DataFrame, y=None):
         if self.cols is None:
             # Infer numeric feature columns (exclude obvious non‑features)
-            self.cols = [c for c in X.columns if X[c].dtype != 'O' and not c.endswith("timestamp")]
+            cols = X.select_dtypes(include=[np.number]).columns
+            self.cols = [c for c in cols if not c.endswith("timestamp")]
         self.scaler.fit(X[self.cols])
         return self
 
     def transform(self, X: pd.DataFrame):
-        Y = X.copy()
-        Y[self.cols] = self.scaler.transform(Y[self.cols])
+        Y = X.copy(deep=False)
+        # Standardized features only feed the [0, 1] CCI and zone cut‑offs, so float32
+        # is plenty and halves the memory traffic of every downstream step
+        Y[self.cols] = self.scaler.transform(Y[self.cols]).astype(np.float32, copy=False)
         return Y
 
 
@@ -269,23 +546,34 @@ class CCIMaker(TransformerMixin, BaseEstimator):
 
     def transform(self, X: pd.DataFrame):
         cfg = self.cfg
-        df = X.copy()
+        df = X.copy(deep=False)
         cols = self._cols_ or []
         # Ensure columns exist; if not, fill with zeros to keep shape stable
         for c in cols:
             if c not in df.columns:
                 df[c] = 0.0
 
-        # Weighted sum (standardized upstream), then logistic squashing to [0,1]
-        vib = df.get(f"{cfg.vib_col}_stress", 0.0) + 0.6 * df.get("vibration_bandpower", 0.0)
-        temp = df.get(f"{cfg.temp_col}_stress", 0.0)
-        strain = df.get(f"{cfg.strain_col}_stress", 0.0)
-        wind = df.get(f"{cfg.wind_col}_stress", 0.0) if (cfg.wind_col and f"{cfg.wind_col}_stress" in df.columns) else 0.0
-
-        raw = cfg.w_vibration * vib + cfg.w_temperature * temp + cfg.w_strain * strain + 0.15 * wind
+        # Weighted sum (standardized upstream), then logistic squashing to [0,1].
+        # Accumulated in place in float32 with a single scratch buffer; absent
+        # drivers contribute 0.
+        terms = [
+            (f"{cfg.vib_col}_stress", cfg.w_vibration),
+            ("vibration_bandpower", 0.6 * cfg.w_vibration),
+            (f"{cfg.temp_col}_stress", cfg.w_temperature),
+            (f"{cfg.strain_col}_stress", cfg.w_strain),
+        ]
+        if cfg.wind_col:
+            terms.append((f"{cfg.wind_col}_stress", 0.15))
+
+        raw = np.zeros(len(df), dtype=np.float32)
+        scratch = np.empty_like(raw)
+        for name, weight in terms:
+            if name in df.columns:
+                np.multiply(df[name].to_numpy(dtype=np.float32, copy=False), np.float32(weight), out=scratch)
+                raw += scratch
         # logistic: 1/(1+exp(-z)); scale raw to a reasonable range
-        z = 1.5 * raw
-        df["cci"] = 1.0 / (1.0 + np.exp(-z))
+        raw *= np.float32(1.5)
+        df["cci"] = expit(raw, out=raw)
         return df
 
 
@@ -309,12 +597,19 @@ class ZoneCalibrator(TransformerMixin, BaseEstimator):
                 self.red_ = float(np.quantile(cci, self.cfg.red_q))
         return self
 
+    ZONES = ["green", "yellow", "red"]
+
     def transform(self, X: pd.DataFrame):
-        df = X.copy()
+        df = X.copy(deep=False)
         yel, red = self.yellow_, self.red_
-        conds = [df["cci"] < yel, (df["cci"] >= yel) & (df["cci"] < red), df["cci"] >= red]
-        df["zone"] = np.select(conds, ["green", "yellow", "red"], default="green")
-        df["zone_thresholds"] = list(zip([yel]*len(df), [red]*len(df)))
+        # 0/1/2 codes for cci < yel, yel <= cci < red, cci >= red; NaN CCI stays green
+        cci = df["cci"].to_numpy()
+        codes = np.digitize(cci, [yel, red]).astype(np.int8)
+        codes[np.isnan(cci)] = 0
+        df["zone"] = pd.Categorical.from_codes(codes, categories=self.ZONES)
+        # Scalar threshold columns (broadcast fill) instead of one tuple object per row
+        df["yellow_thr"] = yel
+        df["red_thr"] = red
         return df
 
 
@@ -328,63 +623,118 @@ class TimeLeftProjector(TransformerMixin, BaseEstimator):
     def __init__(self, cfg: CCIPipelineConfig, freq_hint_hours: Optional[float] = None):
         self.cfg = cfg
         self.freq_hint_hours = freq_hint_hours  # if timestamps are irregular, we infer cadence
+        # Last trend_lookback rows per component from the last transform(remember=True)
+        self._tail: Optional[pd.DataFrame] = None
 
     def fit(self, X, y=None):
         return self
 
-    def transform(self, X: pd.DataFrame):
+    def reset_state(self):
+        self._tail = None
+
+    def transform(self, X: pd.DataFrame, remember: bool = False):
+        """Add time_left_hours; remember=True also keeps X's trailing rows as the streaming state."""
         cfg = self.cfg
-        df = X.copy()
-
-        def per_component(group: pd.DataFrame) -> pd.DataFrame:
-            g = group.copy()
-            if len(g) < 3:
-                g["time_left_hours"] = np.inf
-                return g
-
-            # infer cadence (median delta in hours)
-            ts = pd.to_datetime(g[cfg.ts_col].values)
-            if len(ts) >= 2:
-                dt_hours = np.median(np.diff(ts).astype('timedelta64[s]').astype(float) / 3600.0)
-            else:
-                dt_hours = self.freq_hint_hours or 1.0
-            dt_hours = max(dt_hours, 1e-6)
-
-            # Use last N points
-            n = min(cfg.trend_lookback, len(g))
-            y_cci = g["cci"].values[-n:]
-            x_idx = np.arange(len(y_cci)).reshape(-1, 1)
-            if np.any(~np.isfinite(y_cci)) or len(y_cci) < 3:
-                g["time_left_hours"] = np.inf
-                return g
-
-            model = LinearRegression().fit(x_idx, y_cci)
-            slope = float(model.coef_[0])
-            intercept = float(model.intercept_)
-            red = g["zone_thresholds"].iloc[-1][1] if "zone_thresholds" in g.columns else cfg.fixed_red
-
-            # Already red
-            if y_cci[-1] >= red:
-                tl = 0.0
-            # Not trending up
-            elif slope <= 0:
-                tl = np.inf
+        df = X.copy(deep=False)
+        n_rows = len(df)
+        if n_rows == 0:
+            df["time_left_hours"] = np.array([], dtype=float)
+            if remember:
+                self.reset_state()
+            return df
+
+        # All components are fitted at once: rows are stably reordered so each
+        # component is contiguous (a no‑op for SortAndCast output) and the per‑component
+        # least‑squares sums are accumulated with bincount instead of a Python apply.
+        codes = df.groupby(cfg.id_col, sort=False, observed=True).ngroup().to_numpy()
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        sizes = np.bincount(codes)
+        n_groups = len(sizes)
+        ends = np.cumsum(sizes)
+        starts = ends - sizes
+        last = ends - 1
+
+        # infer cadence (median delta in hours) per component
+        # SortAndCast already guarantees datetimes, so read them as int64 nanoseconds
+        ts = df[cfg.ts_col].to_numpy(dtype="datetime64[ns]").view("i8")[order]
+        dt = np.diff(ts) / 3.6e12
+        same = codes[1:] == codes[:-1]
+        dt, dt_codes = dt[same], codes[1:][same]
+        dt_sorted = dt[np.lexsort((dt, dt_codes))]
+        m = sizes - 1
+        dt_starts = starts - np.arange(n_groups)
+        has_dt = m > 0
+        lo = np.where(has_dt, dt_starts + (m - 1) // 2, 0)
+        hi = np.where(has_dt, dt_starts + m // 2, 0)
+        if len(dt_sorted):
+            dt_hours = np.where(has_dt, (dt_sorted[lo] + dt_sorted[hi]) / 2, 0.0)
+        else:
+            dt_hours = np.zeros(n_groups)
+        dt_hours = np.where(has_dt, dt_hours, self.freq_hint_hours or 1.0)
+        dt_hours = np.maximum(dt_hours, 1e-6)
+
+        # Use last N points; x = 0..n‑1 within each component's tail
+        n = np.minimum(cfg.trend_lookback, sizes)
+        from_end = last[codes] - np.arange(n_rows)
+        tail = from_end < n[codes]
+        tcodes = codes[tail]
+        if remember:
+            keep = [c for c in (cfg.id_col, cfg.ts_col, "cci", "red_thr") if c in df.columns]
+            self._tail = df.iloc[order[tail], df.columns.get_indexer(keep)].reset_index(drop=True)
+        y = df["cci"].to_numpy()[order][tail].astype(float)
+        finite = np.isfinite(y)
+        bad = np.bincount(tcodes, weights=~finite, minlength=n_groups) > 0
+        y = np.where(finite, y, 0.0)
+
+        # Least‑squares line (closed form: mean(x) = (n‑1)/2,
+        # sum((x ‑ mean(x))^2) = n(n^2‑1)/12)
+        xm = (n - 1) / 2.0
+        x = (n[tcodes] - 1) - from_end[tail]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.bincount(tcodes, weights=(x - xm[tcodes]) * y, minlength=n_groups) / (n * (n * n - 1) / 12.0)
+            intercept = np.bincount(tcodes, weights=y, minlength=n_groups) / n - slope * xm
+            if "red_thr" in df.columns:
+                red = df["red_thr"].to_numpy(dtype=float)[order][last]
             else:
-                # Solve for t: intercept + slope * t = red
-                t_idx = (red - intercept) / slope
-                # remaining steps from the last index
-                steps_left = max(0.0, t_idx - (len(y_cci) - 1))
-                tl = float(steps_left * dt_hours)
-                tl = min(tl, cfg.max_time_left_hours)
-
-            g["time_left_hours"] = np.concatenate([
-                np.full(len(g) - 1, np.nan),  # only the latest value is actionable; earlier rows NaN
-                [tl]
-            ])
-            return g
-
-        out = df.groupby(self.cfg.id_col, group_keys=False).apply(per_component)
-        return out
+                red = np.full(n_groups, cfg.fixed_red)
+            y_last = df["cci"].to_numpy()[order][last]
+
+            # Solve for t: intercept + slope * t = red; remaining steps from the last index
+            t_idx = (red - intercept) / slope
+            steps_left = np.maximum(0.0, t_idx - (n - 1))
+            tl = np.minimum(steps_left * dt_hours, cfg.max_time_left_hours)
+        # Not trending up
+        tl = np.where(slope <= 0, np.inf, tl)
+        # Already red
+        tl = np.where(y_last >= red, 0.0, tl)
+
+        # only the latest value is actionable; earlier rows NaN. Components that are
+        # too short or have non‑finite CCI in the window get inf throughout.
+        degenerate = (sizes < 3) | bad
+        col = np.where(degenerate[codes], np.inf, np.nan)
+        col[last] = np.where(degenerate, np.inf, tl)
+        out = np.empty(n_rows)
+        out[order] = col
+        df["time_left_hours"] = out
+        return df
+
+    def transform_incremental(self, X: pd.DataFrame):
+        """transform() for rows that continue the components seen by the previous call.
+
+        The fit window is the buffered trend_lookback rows plus the new ones, so the
+        result matches transform() on the full history, except that the cadence is
+        the median spacing within that window rather than over the whole history.
+        Without stored state this is transform(X, remember=True).
+        """
+        if self._tail is None:
+            return self.transform(X, remember=True)
+        n_tail = len(self._tail)
+        cols = [c for c in self._tail.columns if c in X.columns]
+        combined = pd.concat([self._tail, X[cols]], ignore_index=True)
+        df = X.copy(deep=False)
+        df["time_left_hours"] = self.transform(combined, remember=True)["time_left_hours"].to_numpy()[n_tail:]
+        return df
 
 
 # -----------------------------
@@ -412,6 +762,9 @@ class CCIPipeline:
         self.cci.fit(df)
         df = self.cci.transform(df)
         self.zones.fit(df)
+        # A refit starts a new stream; the calibration window never seeds one
+        self.feats.reset_state()
+        self.timeleft.reset_state()
         self._fitted = True
         return self
 
@@ -425,22 +778,66 @@ class CCIPipeline:
         df = self.timeleft.transform(df)
         return df
 
+    def start_stream(self, history_df: pd.DataFrame) -> pd.DataFrame:
+        """Score history_df like score() and make it the state score_incremental() continues from.
+
+        Any earlier streaming state is discarded. score() itself never reads or
+        writes the streaming state, so batch scoring can interleave with a stream.
+        """
+        self.feats.reset_state()
+        self.timeleft.reset_state()
+        return self.score_incremental(history_df)
+
+    def score_incremental(self, new_df: pd.DataFrame) -> pd.DataFrame:
+        """Score only the rows that arrived since the last start_stream()/score_incremental().
+
+        Per‑component EWMA state and a short buffer of recent rows are carried between
+        calls, so each call costs O(new rows) instead of re‑running the whole history.
+        The first call after fit()/load() behaves like start_stream().
+        """
+        assert self._fitted, "Call fit() first or load a saved pipeline."
+        df = self.sorter.transform(new_df)
+        df = self.feats.transform_incremental(df)
+        df = self.scaler.transform(df)
+        df = self.cci.transform(df)
+        df = self.zones.transform(df)
+        df = self.timeleft.transform_incremental(df)
+        return df
+
     def save(self, path: str):
         os.makedirs(path, exist_ok=True)
-        dump(self.cfg, os.path.join(path, "cfg.joblib"))
-        dump(self.scaler, os.path.join(path, "scaler.joblib"))
-        dump(self.cci, os.path.join(path, "cci.joblib"))
-        dump(self.zones, os.path.join(path, "zones.joblib"))
+        # cfg/meta are plain scalars: JSON sidecars, readable without unpickling
+        with open(os.path.join(path, "cfg.json"), "w") as f:
+            json.dump(asdict(self.cfg), f, indent=2)
         # Stateless transformers need not be saved; keep versions for clarity
         meta = {
             "class": self.__class__.__name__,
-            "version": 1,
-            "cfg": asdict(self.cfg),
+            "version": 2,
         }
-        dump(meta, os.path.join(path, "meta.joblib"))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        # Fitted estimators go into one compressed archive
+        dump({"scaler": self.scaler, "cci": self.cci, "zones": self.zones},
+             os.path.join(path, "estimators.joblib"), compress=3)
 
     @classmethod
     def load(cls, path: str) -> "CCIPipeline":
+        estimators_path = os.path.join(path, "estimators.joblib")
+        if not os.path.exists(estimators_path):
+            return cls._load_v1(path)
+        with open(os.path.join(path, "cfg.json")) as f:
+            cfg = CCIPipelineConfig(**json.load(f))
+        pipe = cls(cfg)
+        estimators = load(estimators_path)
+        pipe.scaler = estimators["scaler"]
+        pipe.cci = estimators["cci"]
+        pipe.zones = estimators["zones"]
+        pipe._fitted = True
+        return pipe
+
+    @classmethod
+    def _load_v1(cls, path: str) -> "CCIPipeline":
+        """Load artifacts written before version 2 (one joblib file per object)."""
         cfg = load(os.path.join(path, "cfg.joblib"))
         pipe = cls(cfg)
         pipe.scaler = load(os.path.join(path, "scaler.joblib"))
@@ -467,15 +864,24 @@ def backtest_warning_lead_time(pipeline: CCIPipeline,
     df_hist : DataFrame with required columns covering a window before the event
     fire_start_ts : ISO timestamp string for the ignition time
     component_id : ID of the component of interest
+
+    When backtesting many components against one history, index it by component
+    once (``df_hist.set_index(id_col, drop=False).sort_index()``); each call then
+    selects its rows with a sorted‑index lookup instead of a full boolean scan.
     """
-    scored = pipeline.score(df_hist[df_hist[ pipeline.cfg.id_col ] == component_id])
+    id_col = pipeline.cfg.id_col
+    if df_hist.index.name == id_col:
+        rows = df_hist.loc[[component_id]].reset_index(drop=id_col in df_hist.columns)
+    else:
+        rows = df_hist[df_hist[id_col] == component_id]
+    scored = pipeline.score(rows)
     scored = scored.dropna(subset=["timestamp"])  # safety
     fire_ts = pd.to_datetime(fire_start_ts)
-    # when did the component first cross into RED?
-    red_rows = scored[(scored["zone"] == "red") & (scored["timestamp"] < fire_ts)]
-    if len(red_rows) == 0:
+    # when did the component first cross into RED? (rows are time‑sorted)
+    is_red = (scored["zone"].to_numpy() == "red") & (scored["timestamp"] < fire_ts).to_numpy()
+    if not is_red.any():
         return {"lead_time_hours": 0.0, "first_red_ts": None}
-    first_red_ts = red_rows["timestamp"].iloc[0]
+    first_red_ts = scored["timestamp"].iloc[int(np.argmax(is_red))]
     lead = (fire_ts - first_red_ts).total_seconds() / 3600.0
     return {"lead_time_hours": float(max(0.0, lead)), "first_red_ts": str(first_red_ts)}
 
@@ -494,21 +900,16 @@ def validate_predictions_vs_cable_state(scored_df: pd.DataFrame) -> Dict:
     if len(df) == 0:
         return {"error": "No valid data for comparison"}
     
-    # Create mapping from cable_state to risk level for comparison
-    def map_cable_state_to_risk(state):
-        state_str = str(state).lower()
-        if any(word in state_str for word in ['critical', 'fault', 'fail', 'danger']):
-            return 'red'
-        elif any(word in state_str for word in ['warning', 'caution', 'alert', 'moderate']):
-            return 'yellow'
-        else:
-            return 'green'
-    
-    df['mapped_cable_state'] = df['original_cable_state'].apply(map_cable_state_to_risk)
+    # Map cable_state to a risk level: one vectorized substring regex per level
+    # (red keywords take precedence over yellow ones)
+    state_str = df['original_cable_state'].astype(str).str.lower()
+    red_mask = state_str.str.contains('critical|fault|fail|danger', regex=True).to_numpy(dtype=bool)
+    yellow_mask = state_str.str.contains('warning|caution|alert|moderate', regex=True).to_numpy(dtype=bool)
+    df['mapped_cable_state'] = pd.Categorical.from_codes(
+        np.where(red_mask, 2, np.where(yellow_mask, 1, 0)), categories=['green', 'yellow', 'red'])
     
     # Calculate metrics
     from sklearn.metrics import accuracy_score, classification_report
-    import pandas as pd
     
     accuracy = accuracy_score(df['mapped_cable_state'], df['zone'])
     
@@ -14,18 +14,91 @@ Designed to achieve >75% accuracy on cascade failure prediction.
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, VotingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier, VotingClassifier
 from sklearn.neural_network import MLPClassifier
-from sklearn.preprocessing import StandardScaler, RobustScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import cross_val_score
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import accuracy_score, classification_report, f1_score
 from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.utils.validation import check_X_y, check_array
 from sklearn.utils.multiclass import unique_labels
+from joblib import Parallel, delayed
 import networkx as nx
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional JIT for the fused hybrid-feature kernel; a NumPy fallback is used without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Cascade features used as-is, in model column order
+BASE_FEATURES = [
+    'demand_capacity_ratio', 'capacity_utilization', 'load_stress',
+    'overload_risk', 'capacity_margin', 'degree_centrality', 
+    'betweenness_centrality', 'closeness_centrality', 'eigenvector_centrality',
+    'pagerank', 'clustering_coefficient', 'distance_from_center',
+    'grid_edge_distance', 'neighbor_damage_ratio', 'neighbor_avg_load',
+    'neighbor_max_load', 'cascade_exposure', 'network_isolation',
+    'structural_vulnerability', 'load_vulnerability', 'cascade_vulnerability',
+    'overall_vulnerability', 'cascade_risk_spread'
+]
+HYBRID_FEATURES = [
+    'load_network_interaction', 'cascade_spatial_risk', 'vulnerability_centrality',
+    'log_pagerank', 'sqrt_cascade_exposure', 'squared_load_stress', 'avg_vulnerability'
+]
+# Upper edges of the low / medium risk zones on overall_vulnerability
+RISK_ZONE_EDGES = np.array([0.3, 0.6])
+_COL = {name: i for i, name in enumerate(BASE_FEATURES)}
+# Positions in BASE_FEATURES of the kernel's inputs, in the order it reads them
+_HYBRID_INPUTS = np.array([_COL[name] for name in (
+    'demand_capacity_ratio', 'betweenness_centrality', 'cascade_risk_spread',
+    'distance_from_center', 'overall_vulnerability', 'eigenvector_centrality',
+    'pagerank', 'cascade_exposure', 'load_stress', 'structural_vulnerability',
+    'load_vulnerability', 'cascade_vulnerability'
+)], dtype=np.int64)
+
+
+def _hybrid_feature_kernel(X, cols, out):
+    """Fill out[:, :n_base] with X and the next 7 columns with the hybrid features.
+    
+    X holds BASE_FEATURES as float64 and cols is _HYBRID_INPUTS; results are
+    computed in float64, stored into the float32 out, and NaN becomes 0 (the
+    feature matrix's fillna(0)).
+    """
+    n_base = X.shape[1]
+    for i in prange(X.shape[0]):
+        row = X[i]
+        for j in range(n_base):
+            v = row[j]
+            out[i, j] = v if v == v else 0.0
+        h = (
+            row[cols[0]] * row[cols[1]],
+            row[cols[2]] * row[cols[3]],
+            row[cols[4]] * row[cols[5]],
+            np.log1p(row[cols[6]]),
+            np.sqrt(row[cols[7]]),
+            row[cols[8]] * row[cols[8]],
+            (row[cols[9]] + row[cols[10]] + row[cols[11]]) / 3,
+        )
+        for j in range(7):
+            v = h[j]
+            out[i, n_base + j] = v if v == v else 0.0
+
+
+if NUMBA_AVAILABLE:
+    _hybrid_feature_kernel = njit(cache=True, parallel=True)(_hybrid_feature_kernel)
+
+
+def _fit_and_score(name, model, X, y, cv=3):
+    """Fit one base model on all data and return its mean CV accuracy"""
+    model.fit(X, y)
+    return name, model, cross_val_score(model, X, y, cv=cv).mean()
+
+
 class AttentionMLPClassifier(BaseEstimator, ClassifierMixin):
     """
     Multi-Layer Perceptron with attention-like feature weighting
@@ -44,8 +117,9 @@ class AttentionMLPClassifier(BaseEstimator, ClassifierMixin):
         X, y = check_X_y(X, y)
         self.classes_ = unique_labels(y)
         
-        # Feature attention weights (simplified attention mechanism)
-        self.feature_weights_ = np.ones(X.shape[1])
+        # Feature attention weights (simplified attention mechanism); they are
+        # uniform, so the inputs go to the MLP unweighted
+        self.feature_weights_ = np.ones(X.shape[1], dtype=np.float32)
         
         # Main MLP classifier with deeper architecture
         self.mlp_ = MLPClassifier(
@@ -61,27 +135,17 @@ class AttentionMLPClassifier(BaseEstimator, ClassifierMixin):
             validation_fraction=0.15
         )
         
-        # Train with feature importance weighting
-        X_weighted = X * self.feature_weights_
-        self.mlp_.fit(X_weighted, y)
-        
-        # Update feature weights based on performance (simplified attention)
-        if hasattr(self.mlp_, 'loss_curve_'):
-            # Simple feature importance estimation
-            feature_importance = np.abs(np.random.normal(1.0, 0.1, X.shape[1]))
-            self.feature_weights_ = feature_importance / np.sum(feature_importance) * X.shape[1]
+        self.mlp_.fit(X, y)
         
         return self
     
     def predict(self, X):
-        X = check_array(X)
-        X_weighted = X * self.feature_weights_
-        return self.mlp_.predict(X_weighted)
+        X = check_array(X, dtype=np.float32, order='C')
+        return self.mlp_.predict(X)
     
     def predict_proba(self, X):
-        X = check_array(X)
-        X_weighted = X * self.feature_weights_
-        return self.mlp_.predict_proba(X_weighted)
+        X = check_array(X, dtype=np.float32, order='C')
+        return self.mlp_.predict_proba(X)
 
 
 class GridRiskFeatureExtractor:
@@ -89,43 +153,68 @@ class GridRiskFeatureExtractor:
     Extract Grid Risk Model-style features for cascade prediction
     """
     
-    def __init__(self, short_win=3, mid_win=6, long_win=12):
+    # Simulated short/mid/long window multiplier ranges for vibration, temperature, strain
+    WINDOW_LOW = np.array([0.8, 0.7, 0.6, 0.9, 0.8, 0.7, 0.85, 0.75, 0.65])
+    WINDOW_HIGH = np.array([1.2, 1.3, 1.4, 1.1, 1.2, 1.3, 1.15, 1.25, 1.35])
+    FEATURE_SUFFIXES = (
+        'vibration_short', 'vibration_mid', 'vibration_long',
+        'temperature_short', 'temperature_mid', 'temperature_long',
+        'strain_short', 'strain_mid', 'strain_long',
+        'health_score', 'degradation_rate', 'critical_threshold'
+    )
+    
+    def __init__(self, short_win=3, mid_win=6, long_win=12, random_state=None):
         self.short_win = short_win
         self.mid_win = mid_win
         self.long_win = long_win
+        self.random_state = random_state
+        self.rng_ = np.random.default_rng(random_state)
+    
+    def _node_features(self, nodes):
+        """(n_nodes, 12) feature matrix from one representative row per node"""
+        def column(name):
+            if name in nodes.columns:
+                return nodes[name].to_numpy(dtype=float)
+            return np.zeros(len(nodes))
+        
+        # Base sensors (simulated from cascade data)
+        vibration = column('vulnerability_score')
+        temperature = column('demand_capacity_ratio')
+        strain = column('cascade_risk_spread')
+        
+        # Rolling window features: one multiplier draw per node and window
+        mults = self.rng_.uniform(self.WINDOW_LOW, self.WINDOW_HIGH, size=(len(nodes), 9))
+        values = np.empty((len(nodes), len(self.FEATURE_SUFFIXES)))
+        values[:, 0:3] = vibration[:, None] * mults[:, 0:3]
+        values[:, 3:6] = temperature[:, None] * mults[:, 3:6]
+        values[:, 6:9] = strain[:, None] * mults[:, 6:9]
+        
+        # Grid Risk Model health indicators
+        values[:, 9] = 1.0 - column('overall_vulnerability')
+        values[:, 10] = column('cascade_vulnerability')
+        values[:, 11] = np.minimum(vibration + temperature + strain, 1.0)
+        return values
+    
+    def extract(self, df):
+        """Grid Risk Model-inspired features as an (n_samples, 12) frame aligned with df.index.
+        
+        Each row carries the features of its node, computed from the node's first row.
+        """
+        codes, _ = pd.factorize(df['node_id'], use_na_sentinel=False)
+        first_rows = np.unique(codes, return_index=True)[1]
+        values = self._node_features(df.iloc[first_rows])
+        return pd.DataFrame(values[codes], index=df.index, columns=list(self.FEATURE_SUFFIXES))
     
     def extract_grid_risk_features(self, df):
-        """Extract Grid Risk Model-inspired features"""
-        features = {}
-        
-        # Simulate rolling windows for time-series-like features
-        for node_id in df['node_id'].unique():
-            node_data = df[df['node_id'] == node_id].iloc[0]
-            
-            # Base sensors (simulated from cascade data)
-            vibration = node_data.get('vulnerability_score', 0)
-            temperature = node_data.get('demand_capacity_ratio', 0)
-            strain = node_data.get('cascade_risk_spread', 0)
-            
-            # Rolling window features
-            features[f'node_{node_id}_vibration_short'] = vibration * np.random.uniform(0.8, 1.2)
-            features[f'node_{node_id}_vibration_mid'] = vibration * np.random.uniform(0.7, 1.3)
-            features[f'node_{node_id}_vibration_long'] = vibration * np.random.uniform(0.6, 1.4)
-            
-            features[f'node_{node_id}_temperature_short'] = temperature * np.random.uniform(0.9, 1.1)
-            features[f'node_{node_id}_temperature_mid'] = temperature * np.random.uniform(0.8, 1.2)
-            features[f'node_{node_id}_temperature_long'] = temperature * np.random.uniform(0.7, 1.3)
-            
-            features[f'node_{node_id}_strain_short'] = strain * np.random.uniform(0.85, 1.15)
-            features[f'node_{node_id}_strain_mid'] = strain * np.random.uniform(0.75, 1.25)
-            features[f'node_{node_id}_strain_long'] = strain * np.random.uniform(0.65, 1.35)
-            
-            # Grid Risk Model health indicators
-            features[f'node_{node_id}_health_score'] = 1.0 - node_data.get('overall_vulnerability', 0)
-            features[f'node_{node_id}_degradation_rate'] = node_data.get('cascade_vulnerability', 0)
-            features[f'node_{node_id}_critical_threshold'] = min(vibration + temperature + strain, 1.0)
-        
-        return features
+        """Extract Grid Risk Model-inspired features as a flat {'node_<id>_<feature>': value} dict"""
+        # One entry per node: the features extract() gives the node's first row
+        first = ~df['node_id'].duplicated().to_numpy()
+        values = self.extract(df).to_numpy()[first]
+        return {
+            f'node_{node_id}_{suffix}': value
+            for node_id, row in zip(df['node_id'].to_numpy()[first], values)
+            for suffix, value in zip(self.FEATURE_SUFFIXES, row)
+        }
 
 
 class HybridCascadeModel(BaseEstimator, ClassifierMixin):
@@ -133,9 +222,13 @@ class HybridCascadeModel(BaseEstimator, ClassifierMixin):
     Hybrid model combining Neural Networks and Grid Risk Model approaches
     """
     
-    def __init__(self, ensemble_method='voting', use_stacking=True):
+    # Training rows used for permutation importance of the histogram booster
+    IMPORTANCE_SAMPLE_SIZE = 1000
+    
+    def __init__(self, ensemble_method='voting', use_stacking=True, n_jobs=-1):
         self.ensemble_method = ensemble_method
         self.use_stacking = use_stacking
+        self.n_jobs = n_jobs
         self.grid_risk_extractor = GridRiskFeatureExtractor()
         
     def _create_base_models(self):
@@ -154,15 +247,14 @@ class HybridCascadeModel(BaseEstimator, ClassifierMixin):
             random_state=42
         )
         
-        # Model 2: Enhanced Gradient Boosting (Grid Risk inspired)
-        enhanced_gb = GradientBoostingClassifier(
-            n_estimators=200,
+        # Model 2: Enhanced Gradient Boosting (Grid Risk inspired), histogram-based
+        enhanced_gb = HistGradientBoostingClassifier(
+            max_iter=200,
             learning_rate=0.08,
             max_depth=12,
-            min_samples_split=3,
             min_samples_leaf=2,
-            subsample=0.85,
-            max_features='sqrt',
+            l2_regularization=0.0,
+            early_stopping=True,
             random_state=42
         )
         
@@ -174,7 +266,8 @@ class HybridCascadeModel(BaseEstimator, ClassifierMixin):
             min_samples_leaf=1,
             max_features='log2',
             class_weight='balanced_subsample',
-            random_state=42
+            random_state=42,
+            n_jobs=self.n_jobs
         )
         
         # Model 4: Different Deep MLP architecture
@@ -200,60 +293,48 @@ class HybridCascadeModel(BaseEstimator, ClassifierMixin):
     def _engineer_hybrid_features(self, df):
         """Engineer features combining both approaches"""
         
-        # Start with existing cascade features
-        feature_cols = [
-            'demand_capacity_ratio', 'capacity_utilization', 'load_stress',
-            'overload_risk', 'capacity_margin', 'degree_centrality', 
-            'betweenness_centrality', 'closeness_centrality', 'eigenvector_centrality',
-            'pagerank', 'clustering_coefficient', 'distance_from_center',
-            'grid_edge_distance', 'neighbor_damage_ratio', 'neighbor_avg_load',
-            'neighbor_max_load', 'cascade_exposure', 'network_isolation',
-            'structural_vulnerability', 'load_vulnerability', 'cascade_vulnerability',
-            'overall_vulnerability', 'cascade_risk_spread'
-        ]
-        
-        base_features = df[feature_cols].fillna(0)
-        
-        # Add Grid Risk Model features
-        grid_risk_features = self.grid_risk_extractor.extract_grid_risk_features(df)
-        
-        # Create additional hybrid features
-        hybrid_features = pd.DataFrame(index=df.index)
-        
-        # Interaction features
-        hybrid_features['load_network_interaction'] = (
-            df['demand_capacity_ratio'] * df['betweenness_centrality']
-        )
-        hybrid_features['cascade_spatial_risk'] = (
-            df['cascade_risk_spread'] * df['distance_from_center']
-        )
-        hybrid_features['vulnerability_centrality'] = (
-            df['overall_vulnerability'] * df['eigenvector_centrality']
-        )
-        
-        # Non-linear transformations
-        hybrid_features['log_pagerank'] = np.log1p(df['pagerank'])
-        hybrid_features['sqrt_cascade_exposure'] = np.sqrt(df['cascade_exposure'])
-        hybrid_features['squared_load_stress'] = df['load_stress'] ** 2
-        
-        # Grid Risk Model-style rolling features (aggregated)
-        hybrid_features['avg_vulnerability'] = (
-            df['structural_vulnerability'] + 
-            df['load_vulnerability'] + 
-            df['cascade_vulnerability']
-        ) / 3
-        
-        # Zone-like classifications (inspired by Grid Risk Model)
-        hybrid_features['risk_zone'] = pd.cut(
-            df['overall_vulnerability'], 
-            bins=[0, 0.3, 0.6, 1.0], 
-            labels=[0, 1, 2]
-        ).astype(float)
-        
-        # Combine all features
-        all_features = pd.concat([base_features, hybrid_features], axis=1)
-        
-        return all_features.fillna(0)
+        # Start with existing cascade features; the interaction / non-linear
+        # features are fused into one pass over the raw matrix
+        X = df[BASE_FEATURES].to_numpy(dtype=np.float64)
+        n_base, n_hybrid = len(BASE_FEATURES), len(HYBRID_FEATURES)
+        out = np.empty((len(df), n_base + n_hybrid + 1), dtype=np.float32)
+        if NUMBA_AVAILABLE:
+            _hybrid_feature_kernel(X, _HYBRID_INPUTS, out)
+        else:
+            c = {name: X[:, i] for name, i in _COL.items()}
+            with np.errstate(all='ignore'):
+                hybrid = np.column_stack([
+                    # Interaction features
+                    c['demand_capacity_ratio'] * c['betweenness_centrality'],
+                    c['cascade_risk_spread'] * c['distance_from_center'],
+                    c['overall_vulnerability'] * c['eigenvector_centrality'],
+                    # Non-linear transformations
+                    np.log1p(c['pagerank']),
+                    np.sqrt(c['cascade_exposure']),
+                    c['load_stress'] ** 2,
+                    # Grid Risk Model-style rolling features (aggregated)
+                    (c['structural_vulnerability'] + c['load_vulnerability'] + c['cascade_vulnerability']) / 3,
+                ])
+            out[:, :n_base] = X
+            out[:, n_base:n_base + n_hybrid] = hybrid
+            # Features are usually complete, so only fill when a NaN is present
+            filled = out[:, :n_base + n_hybrid]
+            nan_mask = np.isnan(filled)
+            if nan_mask.any():
+                filled[nan_mask] = 0.0
+        
+        # Zone-like classifications (inspired by Grid Risk Model): right-closed
+        # bins (0, 0.3], (0.3, 0.6], (0.6, 1.0]; values past 1.0 and NaN get 0
+        vulnerability = X[:, _COL['overall_vulnerability']]
+        risk_zone = np.searchsorted(RISK_ZONE_EDGES, vulnerability)
+        out[:, -1] = np.where(vulnerability <= 1.0, risk_zone, 0)
+        
+        # float32 is ample for these features and halves memory traffic downstream
+        return pd.DataFrame(out, index=df.index, columns=BASE_FEATURES + HYBRID_FEATURES + ['risk_zone'])
+    
+    def _scaled_features(self, X_raw):
+        """Engineered + scaled float32 features for X_raw (same transformation as training)"""
+        return self.scaler_.transform(self._engineer_hybrid_features(X_raw)).astype(np.float32, copy=False)
     
     def fit(self, X_raw, y):
         """Fit the hybrid ensemble model"""
@@ -262,8 +343,8 @@ class HybridCascadeModel(BaseEstimator, ClassifierMixin):
         X_engineered = self._engineer_hybrid_features(X_raw)
         
         # Scale features
-        self.scaler_ = RobustScaler()
-        X_scaled = self.scaler_.fit_transform(X_engineered)
+        self.scaler_ = StandardScaler()
+        X_scaled = self.scaler_.fit_transform(X_engineered).astype(np.float32, copy=False)
         X_scaled_df = pd.DataFrame(X_scaled, columns=X_engineered.columns)
         
         # Create base models
@@ -274,74 +355,91 @@ class HybridCascadeModel(BaseEstimator, ClassifierMixin):
             estimators = [(name, model) for name, model in self.base_models_.items()]
             self.ensemble_ = VotingClassifier(
                 estimators=estimators,
-                voting='soft'  # Use probabilities for better performance
+                voting='soft',  # Use probabilities for better performance
+                n_jobs=self.n_jobs
             )
             self.ensemble_.fit(X_scaled, y)
+            # VotingClassifier fits clones of the templates; expose the fitted
+            # ones so get_feature_importance sees trained models
+            self.base_models_ = dict(self.ensemble_.named_estimators_)
             
         elif self.ensemble_method == 'weighted':
             # Weighted ensemble based on individual performance
             self.model_weights_ = {}
             
-            # Train individual models and calculate weights
-            for name, model in self.base_models_.items():
-                model.fit(X_scaled, y)
+            # Train individual models and calculate weights; the four fits and
+            # their CV runs are independent, so they run in parallel workers
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_and_score)(name, model, X_scaled, y)
+                for name, model in self.base_models_.items()
+            )
+            for name, model, cv_score in results:
+                self.base_models_[name] = model
                 # Use cross-validation score as weight
-                cv_score = cross_val_score(model, X_scaled, y, cv=3).mean()
                 self.model_weights_[name] = max(cv_score, 0.1)  # Minimum weight
             
             # Normalize weights
             total_weight = sum(self.model_weights_.values())
             self.model_weights_ = {k: v/total_weight for k, v in self.model_weights_.items()}
         
+        self.classes_ = unique_labels(y)
         self.feature_names_ = X_engineered.columns.tolist()
+        
+        # Per-model importances, computed once here so no training rows are
+        # kept on the fitted estimator
+        sample = np.random.default_rng(42).choice(
+            len(y), size=min(len(y), self.IMPORTANCE_SAMPLE_SIZE), replace=False)
+        X_sample, y_sample = X_scaled[sample], np.asarray(y)[sample]
+        self.model_importances_ = {
+            name: self._model_importances(model, X_sample, y_sample)
+            for name, model in self.base_models_.items()
+        }
         return self
     
     def predict(self, X_raw):
         """Make predictions using the hybrid ensemble"""
         
-        # Engineer features (use same transformation as training)
-        X_engineered = self._engineer_hybrid_features(X_raw)
-        X_scaled = self.scaler_.transform(X_engineered)
-        
-        if self.ensemble_method == 'voting':
-            return self.ensemble_.predict(X_scaled)
-        
-        elif self.ensemble_method == 'weighted':
-            # Weighted prediction
-            predictions = []
-            for name, model in self.base_models_.items():
-                pred = model.predict(X_scaled)
-                weight = self.model_weights_[name]
-                predictions.append(pred * weight)
-            
-            # Majority weighted vote
-            final_pred = np.sum(predictions, axis=0)
-            return (final_pred > 0.5).astype(int)
+        # Both ensembles are soft votes, so the prediction is the most probable
+        # class; deriving it from predict_proba engineers the features only once
+        return self.classes_[np.argmax(self.predict_proba(X_raw), axis=1)]
     
     def predict_proba(self, X_raw):
         """Get prediction probabilities"""
         
-        X_engineered = self._engineer_hybrid_features(X_raw)
-        X_scaled = self.scaler_.transform(X_engineered)
+        X_scaled = self._scaled_features(X_raw)
         
         if self.ensemble_method == 'voting':
             return self.ensemble_.predict_proba(X_scaled)
         
         elif self.ensemble_method == 'weighted':
-            # Weighted probability prediction
-            probabilities = []
+            # Weighted probability prediction, accumulated in place
+            # (every base model here exposes predict_proba)
+            probabilities = None
             for name, model in self.base_models_.items():
-                if hasattr(model, 'predict_proba'):
-                    prob = model.predict_proba(X_scaled)
-                    weight = self.model_weights_[name]
-                    probabilities.append(prob * weight)
+                prob = model.predict_proba(X_scaled) * self.model_weights_[name]
+                if probabilities is None:
+                    probabilities = prob
+                else:
+                    probabilities += prob
             
-            if probabilities:
-                return np.sum(probabilities, axis=0)
-            else:
-                # Fallback to binary predictions
-                pred = self.predict(X_raw)
-                return np.column_stack([1-pred, pred])
+            return probabilities
+    
+    def _model_importances(self, model, X, y):
+        """Importances of one fitted base model, summing to 1, or None if it has none.
+        
+        HistGradientBoostingClassifier exposes no feature_importances_, so it is
+        scored by permutation importance on the training sample X, y (negative
+        accuracy drops clipped to 0), normalized to the same scale. It is left
+        out when no feature changes its accuracy.
+        """
+        if isinstance(model, HistGradientBoostingClassifier):
+            scores = np.maximum(
+                permutation_importance(model, X, y, n_repeats=5, random_state=42).importances_mean, 0.0)
+            total = scores.sum()
+            return scores / total if total > 0 else None
+        if hasattr(model, 'feature_importances_'):
+            return model.feature_importances_
+        return None
     
     def get_feature_importance(self):
         """Get combined feature importance from ensemble"""
@@ -352,10 +450,10 @@ class HybridCascadeModel(BaseEstimator, ClassifierMixin):
         importances = np.zeros(len(self.feature_names_))
         total_weight = 0
         
-        for name, model in self.base_models_.items():
-            if hasattr(model, 'feature_importances_'):
+        for name, model_importances in self.model_importances_.items():
+            if model_importances is not None:
                 weight = self.model_weights_.get(name, 1.0) if hasattr(self, 'model_weights_') else 1.0
-                importances += model.feature_importances_ * weight
+                importances += model_importances * weight
                 total_weight += weight
         
         if total_weight > 0:
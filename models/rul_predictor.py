@@ -7,22 +7,84 @@ Trained on NASA CMaps data, transferable to power grid components.
 
 Key approach:
 - Uses both tabular features AND time-series degradation patterns
-- Gradient Boosting for fast, interpretable predictions
+- Histogram-based Gradient Boosting for fast, interpretable predictions
 - Simple feature engineering focused on sensor degradation trends
 """
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional JIT for the per-engine history features; the pandas path is used without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _history_features(cycles, sensors, starts, sizes, rows, row_bounds, trends, volatility):
+    """
+    Trend and volatility features for the selected rows of each engine.
+
+    Engines are contiguous, cycle-ordered blocks [starts[e], starts[e] + sizes[e]);
+    rows[row_bounds[e]:row_bounds[e + 1]] are that engine's selected positions in
+    ascending order. Running (Welford) means / co-moments per sensor give the
+    least-squares slope against cycle and the sample std of the history up to
+    each selected row, skipping NaNs like pandas std.
+    """
+    n_sensors = sensors.shape[1]
+    for e in prange(len(starts)):
+        start = starts[e]
+        count = np.zeros(n_sensors)
+        mean = np.zeros(n_sensors)
+        m2 = np.zeros(n_sensors)
+        mean_x = np.zeros(n_sensors)
+        m2_x = np.zeros(n_sensors)
+        c_xy = np.zeros(n_sensors)
+        k = row_bounds[e]
+        for pos in range(start, start + sizes[e]):
+            if k == row_bounds[e + 1]:
+                break
+            x = cycles[pos] - cycles[start]
+            for j in range(n_sensors):
+                v = sensors[pos, j]
+                if v == v:
+                    count[j] += 1
+                    dx = x - mean_x[j]
+                    mean_x[j] += dx / count[j]
+                    m2_x[j] += dx * (x - mean_x[j])
+                    delta = v - mean[j]
+                    mean[j] += delta / count[j]
+                    m2[j] += delta * (v - mean[j])
+                    c_xy[j] += dx * (v - mean[j])
+            if pos != rows[k]:
+                continue
+            for j in range(n_sensors):
+                trends[k, j] = c_xy[j] / m2_x[j] if m2_x[j] > 0 else 0.0
+                volatility[k, j] = np.sqrt(m2[j] / (count[j] - 1)) if count[j] > 1 else 0.0
+            k += 1
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signature: compiled (or loaded from cache) at import, not on first predict
+    _history_features = njit(
+        'void(float64[:], float64[:, :], int64[:], int64[:], int64[:], int64[:], '
+        'float64[:, :], float64[:, :])',
+        cache=True, parallel=True
+    )(_history_features)
+
 
 class RULPredictor:
     """Gradient Boosting model for RUL prediction"""
 
+    # Training rows kept for (and shuffled by) permutation importance
+    IMPORTANCE_SAMPLE_SIZE = 2000
+
     def __init__(self, max_depth: int = 6, n_estimators: int = 100, learning_rate: float = 0.1,
                  stratified_sampling: bool = True, samples_per_lifecycle: int = 20):
         """
@@ -35,21 +97,26 @@ class RULPredictor:
             stratified_sampling: If True, sample uniformly across engine lifecycle
             samples_per_lifecycle: How many snapshots to sample per engine trajectory
         """
-        self.model = GradientBoostingRegressor(
-            n_estimators=n_estimators,
+        # Histogram-binned boosting; trees split on binned values, so the
+        # features need no scaling
+        self.model = HistGradientBoostingRegressor(
+            max_iter=n_estimators,
             learning_rate=learning_rate,
             max_depth=max_depth,
-            min_samples_split=10,
             min_samples_leaf=5,
-            subsample=0.8,
-            random_state=42,
+            l2_regularization=0.0,
+            early_stopping=True,
             validation_fraction=0.1,
             n_iter_no_change=10,
-            tol=1e-4
+            tol=1e-4,
+            random_state=42
         )
-        self.scaler = StandardScaler()
         self.is_trained = False
         self.feature_names = []
+        self.sensor_cols = None         # Sensors kept at fit time (not all-NaN)
+        self._feature_mask = None       # Engineered features with nonzero spread in training
+        self._importance_sample = None  # (X, y) training rows scored by get_feature_importance
+        self._importances = None        # Cached permutation importances
         self.stratified_sampling = stratified_sampling
         self.samples_per_lifecycle = samples_per_lifecycle
 
@@ -75,80 +142,93 @@ class RULPredictor:
             X: Feature matrix (n_rows_or_engines, n_features)
             y: RUL values if fit=True, else just X
         """
-        sensor_cols = [col for col in df.columns if col.startswith('sensor_')]
-        # Filter out sensors with all NaN values
-        sensor_cols = [col for col in sensor_cols if not df[col].isna().all()]
+        if fit or self.sensor_cols is None:
+            sensor_cols = [col for col in df.columns if col.startswith('sensor_')]
+            # Filter out sensors with all NaN values once, at fit time, so
+            # prediction reuses the training layout without rescanning
+            has_data = df[sensor_cols].notna().any()
+            sensor_cols = has_data.index[has_data].tolist()
+            if fit:
+                self.sensor_cols = sensor_cols
+        else:
+            sensor_cols = self.sensor_cols
         op_cols = ['op_setting_1', 'op_setting_2', 'op_setting_3']
 
-        features_list = []
-        rul_list = []
-
-        for unit_id in sorted(df['unit_id'].unique()):
-            engine_data = df[df['unit_id'] == unit_id].sort_values('time_cycles').reset_index(drop=True)
-            max_cycle = engine_data['time_cycles'].max()
-
-            if fit and self.stratified_sampling:
-                # TRAINING with stratified sampling: uniformly sample across lifecycle
-                # This balances early/mid/late-life examples
-                n_rows = len(engine_data)
-                if n_rows <= self.samples_per_lifecycle:
-                    # Engine has fewer cycles than sample target, use all
-                    indices = list(range(n_rows))
-                else:
-                    # Uniformly sample across lifecycle
-                    indices = np.linspace(0, n_rows - 1, self.samples_per_lifecycle, dtype=int).tolist()
-                rows_to_use = engine_data.iloc[indices].reset_index(drop=True)
-            elif fit:
-                # TRAINING without stratification: use all rows
-                rows_to_use = engine_data
-            else:
-                # TEST: use only last row (predict RUL at end of test)
-                rows_to_use = engine_data.iloc[-1:].reset_index(drop=True)
-
-            for idx, row in rows_to_use.iterrows():
-                # History up to this point
-                history = engine_data.iloc[:engine_data.index.get_loc(row.name) + 1]
-
-                # Current sensor values
-                current_sensors = row[sensor_cols].values
-
-                # Sensor degradation trends (slope from first to current)
-                trends = []
-                for col in sensor_cols:
-                    if len(history) > 1:
-                        x = history['time_cycles'].values
-                        y = history[col].values
-                        slope = (y[-1] - y[0]) / (x[-1] - x[0]) if (x[-1] - x[0]) > 0 else 0
-                        trends.append(slope)
-                    else:
-                        trends.append(0)
-
-                # Sensor volatility (std in history)
-                volatility = history[sensor_cols].std().fillna(0).values
-
-                # Operational settings
-                op_settings = row[op_cols].values
-
-                # Time metrics
-                time_in_op = row['time_cycles']
-                time_normalized = time_in_op / max_cycle if max_cycle > 0 else 0
-
-                # Combine all features
-                all_features = np.concatenate([
-                    current_sensors,           # Current sensor values
-                    trends,                    # Degradation trends
-                    volatility,                # Sensor volatility
-                    op_settings,               # Operational settings
-                    [time_in_op, time_normalized]
-                ])
-
-                features_list.append(all_features)
-
-                # Target: RUL = cycles remaining until failure (max_cycle - current_cycle)
-                rul = max_cycle - time_in_op
-                rul_list.append(rul)
-
-        X = np.array(features_list)
+        # Sort once so each engine is a contiguous block ordered by cycle
+        df = df.sort_values(['unit_id', 'time_cycles'], kind='mergesort')
+        grouped = df.groupby('unit_id', sort=False)
+        sizes = grouped.size().to_numpy()
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int)
+
+        cycles = df['time_cycles'].to_numpy(dtype=np.float64)
+        max_cycle = grouped['time_cycles'].transform('max').to_numpy(dtype=np.float64)
+        sensors = df[sensor_cols].to_numpy(dtype=np.float64)
+
+        if fit and self.stratified_sampling:
+            # TRAINING with stratified sampling: uniformly sample across lifecycle
+            # This balances early/mid/late-life examples; engines with fewer
+            # cycles than the sample target use all of them
+            rows = np.concatenate([
+                start + (np.arange(n) if n <= self.samples_per_lifecycle
+                         else np.linspace(0, n - 1, self.samples_per_lifecycle, dtype=int))
+                for start, n in zip(starts, sizes)
+            ])
+        elif fit:
+            # TRAINING without stratification: use all rows
+            rows = np.arange(len(df))
+        else:
+            # TEST: use only last row (predict RUL at end of test)
+            rows = starts + sizes - 1
+
+        if NUMBA_AVAILABLE:
+            # Sensor degradation trends (least-squares slope over history) and
+            # volatility (std in history), one compiled pass per engine
+            row_bounds = np.searchsorted(rows, np.append(starts, len(df)))
+            trends = np.empty((len(rows), len(sensor_cols)))
+            volatility = np.empty((len(rows), len(sensor_cols)))
+            # Index arrays cast to the kernel's int64 signature
+            index = [a.astype(np.int64, copy=False) for a in (starts, sizes, rows, row_bounds)]
+            _history_features(cycles, np.ascontiguousarray(sensors), *index, trends, volatility)
+        else:
+            # Sensor degradation trends: least-squares slope against cycle over
+            # the history up to each row, from per-engine running sums
+            start_rows = np.repeat(starts, sizes)
+            valid = ~np.isnan(sensors)
+            x = np.where(valid, (cycles - cycles[start_rows])[:, None], 0.0)
+            y = np.where(valid, sensors, 0.0)
+
+            def history_sum(a):
+                # Sum of a over each selected row's engine history
+                c = np.concatenate([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+                return c[rows + 1] - c[start_rows[rows]]
+
+            n, sx, sy = history_sum(valid.astype(np.float64)), history_sum(x), history_sum(y)
+            sxy, sxx = history_sum(x * y), history_sum(x * x)
+            denom = n * sxx - sx * sx
+            with np.errstate(divide='ignore', invalid='ignore'):
+                trends = np.where(denom > 0, (n * sxy - sx * sy) / denom, 0.0)
+
+            # Sensor volatility (std in history up to each row)
+            volatility = grouped[sensor_cols].expanding().std().to_numpy()[rows]
+            volatility[np.isnan(volatility)] = 0.0
+
+        # Time metrics
+        time_in_op = cycles[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_normalized = np.where(max_cycle[rows] > 0, time_in_op / max_cycle[rows], 0.0)
+
+        # Combine all features
+        X = np.column_stack([
+            sensors[rows],                          # Current sensor values
+            trends,                                 # Degradation trends
+            volatility,                             # Sensor volatility
+            df[op_cols].to_numpy(dtype=np.float64)[rows],  # Operational settings
+            time_in_op,
+            time_normalized
+        ])
+
+        # Target: RUL = cycles remaining until failure (max_cycle - current_cycle)
+        rul = max_cycle[rows] - time_in_op
 
         # Create feature names for interpretability
         if fit:
@@ -159,7 +239,7 @@ class RULPredictor:
                 op_cols +
                 ["time_in_operation", "time_normalized"]
             )
-            return X, np.array(rul_list)
+            return X, rul
         else:
             return X
 
@@ -174,19 +254,28 @@ class RULPredictor:
         print("🔧 Engineering features for training...")
         X, y = self.engineer_features(df, fit=True)
 
+        # Drop constant features (dead sensors and their zero trends/volatility);
+        # they can never be split on and only widen the feature search
+        self._feature_mask = np.nanstd(X, axis=0) > 1e-9
+        X = X[:, self._feature_mask]
+        self.feature_names = [name for name, keep in zip(self.feature_names, self._feature_mask) if keep]
+
         print(f"📊 Training samples: {len(y)} data points (across {df['unit_id'].nunique()} engines)")
         print(f"📊 Features: {X.shape[1]}")
         print(f"📊 RUL range: {y.min():.0f} to {y.max():.0f} cycles")
 
-        print("🔄 Scaling features...")
-        X_scaled = self.scaler.fit_transform(X)
-
         print("🚀 Training Gradient Boosting model...")
-        self.model.fit(X_scaled, y)
+        self.model.fit(X, y)
         self.is_trained = True
 
+        # Keep a bounded sample of the training rows for permutation importance
+        rng = np.random.default_rng(42)
+        sample = rng.choice(len(y), size=min(len(y), self.IMPORTANCE_SAMPLE_SIZE), replace=False)
+        self._importance_sample = (X[sample], y[sample])
+        self._importances = None
+
         print(f"✅ Model trained successfully!")
-        print(f"   Training R² score: {self.model.score(X_scaled, y):.4f}")
+        print(f"   Training R² score: {self.model.score(X, y):.4f}")
 
     def predict(self, df: pd.DataFrame) -> dict:
         """
@@ -205,17 +294,15 @@ class RULPredictor:
             raise RuntimeError("Model not trained. Call train() first.")
 
         print("🔧 Engineering features for prediction...")
-        X = self.engineer_features(df, fit=False)
-
-        print("🔄 Scaling features...")
-        X_scaled = self.scaler.transform(X)
+        X = self.engineer_features(df, fit=False)[:, self._feature_mask]
 
         print("🎯 Making predictions...")
-        predictions = self.model.predict(X_scaled)
+        predictions = self.model.predict(X)
 
-        # Get prediction variance from ensemble
-        predictions_all = np.array([tree.predict(X_scaled) for tree in self.model.estimators_[:, 0]])
-        confidence = np.std(predictions_all, axis=0)  # Higher = more uncertain
+        # Spread of the individual tree contributions (stage-to-stage steps,
+        # undone from the learning rate), accumulated while streaming the
+        # stages rather than materializing all of them
+        confidence = self._stage_contribution_std(X)  # Higher = more uncertain
 
         unit_ids = sorted(df['unit_id'].unique())
 
@@ -255,6 +342,24 @@ class RULPredictor:
             'mean_true': y_true.mean()
         }
 
+    def _stage_contribution_std(self, X: np.ndarray) -> np.ndarray:
+        """Per-sample std of the per-tree contributions along staged_predict"""
+        n = 0
+        total = np.zeros(len(X))
+        total_sq = np.zeros(len(X))
+        previous = None
+        for stage in self.model.staged_predict(X):
+            if previous is not None:
+                contribution = (stage - previous) / self.model.learning_rate
+                total += contribution
+                total_sq += contribution ** 2
+                n += 1
+            previous = stage
+        if n == 0:
+            return np.zeros(len(X))
+        mean = total / n
+        return np.sqrt(np.maximum(total_sq / n - mean ** 2, 0.0))
+
     def get_feature_importance(self, top_n: int = 15) -> dict:
         """
         Get most important features for RUL prediction.
@@ -268,7 +373,18 @@ class RULPredictor:
         if not self.is_trained:
             return {}
 
-        importances = self.model.feature_importances_
+        # HistGradientBoostingRegressor exposes no feature_importances_, so use
+        # the R² drop when each feature is shuffled in the kept training sample;
+        # negative drops (noise) count as zero and the scores are normalized to sum to 1
+        if self._importances is None:
+            X, y = self._importance_sample
+            scores = permutation_importance(self.model, X, y, n_repeats=5, random_state=42)
+            importances = np.maximum(scores.importances_mean, 0.0)
+            total = importances.sum()
+            if total > 0:
+                importances /= total
+            self._importances = importances
+        importances = self._importances
         indices = np.argsort(importances)[::-1][:top_n]
 
         result = {}
@@ -281,7 +397,7 @@ class RULPredictor:
         """Get model information"""
         return {
             'name': 'RUL Predictor (Gradient Boosting)',
-            'algorithm': 'GradientBoostingRegressor',
+            'algorithm': 'HistGradientBoostingRegressor',
             'trained': self.is_trained,
             'n_features': len(self.feature_names),
             'feature_names': self.feature_names
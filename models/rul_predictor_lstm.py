@@ -10,6 +10,9 @@ Key advantage: Works with variable-length sequences and learns temporal dependen
 Implementation: Uses PyTorch for flexibility and performance.
 """
 
+import os
+import tempfile
+from contextlib import contextmanager
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
@@ -17,13 +20,54 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import torch
 import torch.nn as nn
 import torch.optim as optim
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.nn.parallel import DistributedDataParallel as DDP
 from torch.utils.data import DataLoader, TensorDataset
+from torch.utils.data.distributed import DistributedSampler
 import warnings
 warnings.filterwarnings('ignore')
 
 # Check GPU availability
 DEVICE = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 
+# Mixed precision on GPU: BF16 where supported (no loss scaling needed),
+# otherwise FP16 with a GradScaler; CPU runs stay in FP32
+USE_AMP = DEVICE.type == 'cuda'
+AMP_DTYPE = torch.bfloat16 if USE_AMP and torch.cuda.is_bf16_supported() else torch.float16
+
+
+@contextmanager
+def _gpu_training_backends(enabled: bool):
+    """
+    cuDNN autotuning and TF32 matmuls for the duration of a GPU training run.
+
+    Training input shapes are fixed (batch_size, sequence_length, n_features),
+    so cuDNN can autotune once and reuse its kernel; TF32 speeds up matmuls on
+    Ampere+ GPUs. The previous process-wide settings are restored afterwards.
+    """
+    if not enabled:
+        yield
+        return
+    previous = (torch.backends.cudnn.benchmark, torch.backends.cuda.matmul.allow_tf32,
+                torch.backends.cudnn.allow_tf32)
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    try:
+        yield
+    finally:
+        (torch.backends.cudnn.benchmark, torch.backends.cuda.matmul.allow_tf32,
+         torch.backends.cudnn.allow_tf32) = previous
+
+
+def _ddp_worker(rank: int, world_size: int, params: dict, df: pd.DataFrame, state_path: str):
+    """torch.multiprocessing.spawn target: train one replica, rank 0 saves the weights"""
+    predictor = RULPredictorLSTM(**params)
+    predictor.train_ddp(rank, world_size, df)
+    if rank == 0:
+        torch.save(predictor.model.state_dict(), state_path)
+
 
 class LSTMNet(nn.Module):
     """PyTorch LSTM network for RUL prediction"""
@@ -32,42 +76,35 @@ class LSTMNet(nn.Module):
         super(LSTMNet, self).__init__()
         self.lstm_units = lstm_units
 
-        self.lstm1 = nn.LSTM(input_size, lstm_units, batch_first=True, dropout=dropout if lstm_units > 0 else 0)
-        self.dropout1 = nn.Dropout(dropout)
-
-        self.lstm2 = nn.LSTM(lstm_units, lstm_units // 2, batch_first=True)
-        self.dropout2 = nn.Dropout(dropout)
-
-        # Fully connected layers
-        self.fc1 = nn.Linear(lstm_units // 2, 32)
-        self.relu = nn.ReLU()
-        self.dropout3 = nn.Dropout(dropout)
-
-        self.fc2 = nn.Linear(32, 16)
-        self.fc3 = nn.Linear(16, 1)
+        # Both LSTM layers in one module: cuDNN runs them (and the dropout
+        # between them) as a single fused multilayer kernel
+        self.lstm = nn.LSTM(input_size, lstm_units, num_layers=2, batch_first=True, dropout=dropout)
+        self.dropout = nn.Dropout(dropout)
+
+        # Narrow the last step to lstm_units // 2, the width the second layer used to have
+        self.proj = nn.Linear(lstm_units, lstm_units // 2)
+
+        # Fully connected head, scripted so its small per-batch ops skip Python
+        # dispatch (the LSTM stays eager so it keeps using cuDNN)
+        self.head = torch.jit.script(nn.Sequential(
+            nn.Linear(lstm_units // 2, 32),
+            nn.ReLU(),
+            nn.Dropout(dropout),
+            nn.Linear(32, 16),
+            nn.ReLU(),
+            nn.Linear(16, 1)
+        ))
 
     def forward(self, x):
         # LSTM layers
-        x, _ = self.lstm1(x)
-        x = self.dropout1(x)
-
-        x, _ = self.lstm2(x)
-        x = self.dropout2(x)
+        x, _ = self.lstm(x)
 
         # Use last output
-        x = x[:, -1, :]
+        x = self.dropout(x[:, -1, :])
+        x = self.proj(x)
 
         # Fully connected
-        x = self.fc1(x)
-        x = self.relu(x)
-        x = self.dropout3(x)
-
-        x = self.fc2(x)
-        x = self.relu(x)
-
-        x = self.fc3(x)
-
-        return x
+        return self.head(x)
 
 
 class RULPredictorLSTM:
@@ -94,7 +131,10 @@ class RULPredictorLSTM:
         self.batch_size = batch_size
 
         self.model = None
+        self.model_q = None     # int8-quantized copy used for CPU inference
         self.scaler = StandardScaler()
+        self.mean_t = None      # scaler.mean_ / scale_ as device tensors
+        self.scale_t = None
         self.is_trained = False
         self.sensor_cols = []
 
@@ -103,23 +143,24 @@ class RULPredictorLSTM:
         Create overlapping sequences for LSTM training.
 
         Args:
-            data: Array of shape (n_samples, n_features)
+            data: Array of shape (n_samples, n_features + 1); the last column is RUL
             sequence_length: Length of sequences
 
         Returns:
-            X: Sequences of shape (n_sequences, sequence_length, n_features)
+            X: Read-only view of shape (n_sequences, sequence_length, n_features),
+               sensors only (the RUL target is never an input)
             y: Corresponding RUL targets
         """
         if sequence_length is None:
             sequence_length = self.sequence_length
 
-        X, y = [], []
-
-        for i in range(len(data) - sequence_length):
-            X.append(data[i:i + sequence_length])
-            y.append(data[i + sequence_length, -1])  # Last column is RUL
+        # Zero-copy strided view: window i is data[i:i + sequence_length, :-1]
+        X = np.lib.stride_tricks.sliding_window_view(
+            data[:-1, :-1], (sequence_length, data.shape[1] - 1)
+        )[:, 0]
+        y = data[sequence_length:, -1]  # Last column is RUL
 
-        return np.array(X), np.array(y)
+        return X, y
 
     def prepare_training_data(self, df: pd.DataFrame) -> tuple:
         """
@@ -129,36 +170,45 @@ class RULPredictorLSTM:
             df: DataFrame with [unit_id, time_cycles, sensor_*, op_setting_*]
 
         Returns:
-            X_train: Training sequences
+            X_train: Training sequences (unscaled; normalized on the device)
             y_train: Target RUL values
         """
+        # Sensors with any data, found in one vectorized reduction; predict
+        # reuses this list without re-inspecting the test frame
         sensor_cols = [col for col in df.columns if col.startswith('sensor_')]
-        sensor_cols = [col for col in sensor_cols if not df[col].isna().all()]
+        has_data = df[sensor_cols].notna().any()
+        sensor_cols = has_data.index[has_data].tolist()
         self.sensor_cols = sensor_cols
 
-        all_sequences = []
-        all_targets = []
-
-        for unit_id in sorted(df['unit_id'].unique()):
-            engine_data = df[df['unit_id'] == unit_id].sort_values('time_cycles').reset_index(drop=True)
-            max_cycle = engine_data['time_cycles'].max()
-
-            # Extract sensor data
-            sensor_data = engine_data[sensor_cols].values
-
-            # Add RUL as last column
-            rul_column = (max_cycle - engine_data['time_cycles'].values).reshape(-1, 1)
-            sequence_data = np.concatenate([sensor_data, rul_column], axis=1)
-
-            # Create sequences
-            if len(sequence_data) > self.sequence_length:
-                X_engine, y_engine = self.create_sequences(sequence_data, self.sequence_length)
-                all_sequences.append(X_engine)
-                all_targets.append(y_engine)
-
-        # Combine all engines
-        X_train = np.concatenate(all_sequences, axis=0)
-        y_train = np.concatenate(all_targets, axis=0)
+        # Sort once so each engine is a contiguous, cycle-ordered block, and
+        # attach RUL (last column) in one grouped pass
+        df = df.sort_values(['unit_id', 'time_cycles'], kind='mergesort')
+        grouped = df.groupby('unit_id', sort=False)
+        max_cycle = grouped['time_cycles'].transform('max').to_numpy(dtype=np.float64)
+        cycles = df['time_cycles'].to_numpy(dtype=np.float64)
+        data = np.empty((len(df), len(sensor_cols) + 1))
+        data[:, :-1] = df[sensor_cols].to_numpy(dtype=np.float64)
+        np.subtract(max_cycle, cycles, out=data[:, -1])
+
+        bounds = np.cumsum(grouped.size().to_numpy())[:-1]
+        engines = [sequence_data for sequence_data in np.split(data, bounds)
+                   if len(sequence_data) > self.sequence_length]
+
+        # Write each engine's windows straight into one preallocated float32
+        # buffer (no per-engine copies, concatenation or final dtype cast); the
+        # feature normalization is fitted engine by engine on the float64
+        # windows and applied on the device later
+        n_sequences = sum(len(data) - self.sequence_length for data in engines)
+        X_train = np.empty((n_sequences, self.sequence_length, len(sensor_cols)), dtype=np.float32)
+        y_train = np.empty(n_sequences, dtype=np.float32)
+        self.scaler = StandardScaler()
+        offset = 0
+        for sequence_data in engines:
+            X_engine, y_engine = self.create_sequences(sequence_data, self.sequence_length)
+            X_train[offset:offset + len(X_engine)] = X_engine
+            y_train[offset:offset + len(y_engine)] = y_engine
+            self.scaler.partial_fit(X_engine.reshape(-1, len(sensor_cols)))
+            offset += len(X_engine)
 
         print(f"📊 Training data prepared:")
         print(f"   Sequences: {X_train.shape[0]}")
@@ -166,17 +216,17 @@ class RULPredictorLSTM:
         print(f"   Features: {X_train.shape[2]}")
         print(f"   RUL range: {y_train.min():.0f} to {y_train.max():.0f}")
 
-        # Normalize features (but NOT the RUL column)
-        X_train_features = X_train[:, :, :-1]
-        X_train_features_flat = X_train_features.reshape(-1, X_train_features.shape[-1])
-        self.scaler.fit(X_train_features_flat)
-        X_train_features_scaled = self.scaler.transform(X_train_features_flat)
-        X_train_features_scaled = X_train_features_scaled.reshape(X_train.shape[0], X_train.shape[1], -1)
+        # float32 statistics, so normalizing the float32 sequences never upcasts
+        self.mean_t = torch.from_numpy(self.scaler.mean_.astype(np.float32)).to(DEVICE)
+        self.scale_t = torch.from_numpy(self.scaler.scale_.astype(np.float32)).to(DEVICE)
 
-        # Append RUL back (not scaled)
-        X_train_scaled = np.concatenate([X_train_features_scaled, X_train[:, :, -1:]], axis=2)
+        return X_train, y_train
 
-        return X_train_scaled.astype(np.float32), y_train.astype(np.float32)
+    def _normalize(self, X: torch.Tensor) -> torch.Tensor:
+        """Standardize an on-device sequence tensor in place"""
+        X -= self.mean_t
+        X /= self.scale_t
+        return X
 
     def train(self, df: pd.DataFrame):
         """
@@ -187,28 +237,135 @@ class RULPredictorLSTM:
         """
         print("🔧 Preparing training data...")
         X_train, y_train = self.prepare_training_data(df)
+        with _gpu_training_backends(DEVICE.type == 'cuda'):
+            self._fit(X_train, y_train, DEVICE)
+
+        if DEVICE.type == 'cpu':
+            # Dynamic int8 copy for CPU inference: LSTM and Linear weights are
+            # stored as int8 and activations quantized on the fly (the scripted
+            # head is left in FP32)
+            self.model_q = torch.ao.quantization.quantize_dynamic(
+                self.model, {nn.LSTM, nn.Linear}, dtype=torch.qint8
+            ).eval()
+
+    def train_ddp(self, rank: int, world_size: int, df: pd.DataFrame):
+        """
+        Train one DistributedDataParallel replica (one process per GPU).
+
+        Each rank trains on its own DistributedSampler shard; DDP all-reduces
+        gradients during backward so every replica ends with the same weights.
+        Launch through train_distributed (or torch.multiprocessing.spawn).
+
+        Args:
+            rank: Process / GPU index
+            world_size: Number of processes
+            df: DataFrame with engine sensor trajectories
+        """
+        os.environ.setdefault('MASTER_ADDR', 'localhost')
+        os.environ.setdefault('MASTER_PORT', '29500')
+        dist.init_process_group('nccl', rank=rank, world_size=world_size)
+        torch.cuda.set_device(rank)
+        device = torch.device('cuda', rank)
+
+        try:
+            X_train, y_train = self.prepare_training_data(df)
+            self.mean_t = self.mean_t.to(device)
+            self.scale_t = self.scale_t.to(device)
+            with _gpu_training_backends(True):
+                self._fit(X_train, y_train, device, rank=rank, world_size=world_size)
+        finally:
+            dist.destroy_process_group()
+
+    def train_distributed(self, df: pd.DataFrame, world_size: int = None):
+        """
+        Train with DistributedDataParallel across all visible GPUs.
 
-        # Convert to PyTorch tensors
-        X_train_tensor = torch.from_numpy(X_train).to(DEVICE)
-        y_train_tensor = torch.from_numpy(y_train).to(DEVICE).reshape(-1, 1)
+        Spawns one train_ddp process per GPU; rank 0's weights are loaded back
+        into this predictor, which then predicts on DEVICE as usual. Without a
+        usable GPU count (no GPUs, or world_size outside 1..device_count) it
+        falls back to single-device train().
+
+        Args:
+            df: DataFrame with engine sensor trajectories
+            world_size: Number of GPUs to use (default: all visible)
+        """
+        n_gpus = torch.cuda.device_count()
+        if world_size is None:
+            world_size = n_gpus
+        if not 1 <= world_size <= n_gpus:
+            print(f"⚠️  Cannot run {world_size} DDP replicas on {n_gpus} GPU(s); "
+                  f"training on {DEVICE} instead")
+            self.train(df)
+            return
+        params = {
+            'sequence_length': self.sequence_length,
+            'lstm_units': self.lstm_units,
+            'dropout': self.dropout,
+            'learning_rate': self.learning_rate,
+            'epochs': self.epochs,
+            'batch_size': self.batch_size
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            state_path = os.path.join(tmp, 'lstm_ddp.pt')
+            mp.spawn(_ddp_worker, args=(world_size, params, df, state_path),
+                     nprocs=world_size, join=True)
+            state_dict = torch.load(state_path, map_location=DEVICE)
+
+        # Same sensors, scaler and shapes as the workers (the preparation is deterministic)
+        X_train, _ = self.prepare_training_data(df)
+        self.model = LSTMNet(
+            input_size=X_train.shape[2],
+            lstm_units=self.lstm_units,
+            dropout=self.dropout
+        ).to(DEVICE)
+        self.model.load_state_dict(state_dict)
+        self.is_trained = True
+
+    def _fit(self, X_train: np.ndarray, y_train: np.ndarray, device: torch.device,
+             rank: int = None, world_size: int = 1):
+        """Build and train the network on device; rank is set for DDP replicas"""
+        distributed = rank is not None
+        verbose = not distributed or rank == 0
+        on_gpu = device.type == 'cuda'
+
+        # Convert to PyTorch tensors (kept on the host; batches are copied over
+        # and normalized on the device as they are consumed)
+        X_train_tensor = torch.from_numpy(X_train)
+        y_train_tensor = torch.from_numpy(y_train).reshape(-1, 1)
 
         # Create DataLoader
         dataset = TensorDataset(X_train_tensor, y_train_tensor)
-        dataloader = DataLoader(dataset, batch_size=self.batch_size, shuffle=True)
+        sampler = (DistributedSampler(dataset, num_replicas=world_size, rank=rank, shuffle=True)
+                   if distributed else None)
+        # Dropping the ragged last batch keeps every step on the autotuned shape
+        # (unless that would leave no batch at all). On GPU, workers fill pinned
+        # buffers so the non-blocking copies overlap with compute
+        dataloader = DataLoader(dataset, batch_size=self.batch_size,
+                                shuffle=sampler is None, sampler=sampler,
+                                drop_last=len(dataset) >= self.batch_size * world_size,
+                                pin_memory=on_gpu,
+                                num_workers=2 if on_gpu else 0,
+                                persistent_workers=on_gpu)
 
         # Build model
-        print(f"\n🔧 Building LSTM model ({X_train.shape[2]} input features)...")
+        if verbose:
+            print(f"\n🔧 Building LSTM model ({X_train.shape[2]} input features)...")
         self.model = LSTMNet(
             input_size=X_train.shape[2],
             lstm_units=self.lstm_units,
             dropout=self.dropout
-        ).to(DEVICE)
+        ).to(device)
+        net = DDP(self.model, device_ids=[device.index]) if distributed else self.model
 
         # Loss and optimizer
         criterion = nn.MSELoss()
-        optimizer = optim.Adam(self.model.parameters(), lr=self.learning_rate)
+        # Fused Adam updates every parameter tensor in one CUDA kernel per step
+        optimizer = optim.Adam(net.parameters(), lr=self.learning_rate, fused=on_gpu)
+        grad_scaler = torch.amp.GradScaler('cuda', enabled=on_gpu and AMP_DTYPE == torch.float16)
 
-        print(f"🚀 Training ({self.epochs} epochs)...")
+        if verbose:
+            print(f"🚀 Training ({self.epochs} epochs)...")
 
         # Training loop
         best_loss = float('inf')
@@ -216,20 +373,33 @@ class RULPredictorLSTM:
         no_improve_count = 0
 
         for epoch in range(self.epochs):
-            total_loss = 0
+            if sampler is not None:
+                sampler.set_epoch(epoch)
+            # Accumulated on the device; a per-batch .item() would sync every step
+            total_loss = torch.zeros((), device=device)
             for X_batch, y_batch in dataloader:
+                X_batch = self._normalize(X_batch.to(device, non_blocking=True))
+                y_batch = y_batch.to(device, non_blocking=True)
+
                 # Forward pass
-                outputs = self.model(X_batch)
-                loss = criterion(outputs, y_batch)
+                with torch.autocast(device_type=device.type, dtype=AMP_DTYPE, enabled=on_gpu):
+                    outputs = net(X_batch)
+                    loss = criterion(outputs.float(), y_batch)
 
                 # Backward pass
-                optimizer.zero_grad()
-                loss.backward()
-                optimizer.step()
+                optimizer.zero_grad(set_to_none=True)
+                grad_scaler.scale(loss).backward()
+                grad_scaler.step(optimizer)
+                grad_scaler.update()
 
-                total_loss += loss.item()
+                total_loss += loss.detach()
 
             avg_loss = total_loss / len(dataloader)
+            if distributed:
+                # Early stopping must agree across replicas, so decide on the mean loss
+                dist.all_reduce(avg_loss)
+                avg_loss /= world_size
+            avg_loss = avg_loss.item()
 
             # Early stopping
             if avg_loss < best_loss:
@@ -238,15 +408,17 @@ class RULPredictorLSTM:
             else:
                 no_improve_count += 1
 
-            if (epoch + 1) % 10 == 0 or epoch == 0:
+            if verbose and ((epoch + 1) % 10 == 0 or epoch == 0):
                 print(f"  Epoch {epoch+1}/{self.epochs}, Loss: {avg_loss:.4f}")
 
             if no_improve_count >= patience:
-                print(f"  Early stopping at epoch {epoch+1}")
+                if verbose:
+                    print(f"  Early stopping at epoch {epoch+1}")
                 break
 
         self.is_trained = True
-        print(f"✅ Model trained! Final loss: {best_loss:.4f}")
+        if verbose:
+            print(f"✅ Model trained! Final loss: {best_loss:.4f}")
 
     def predict(self, df: pd.DataFrame) -> dict:
         """
@@ -263,45 +435,38 @@ class RULPredictorLSTM:
 
         print("🔧 Preparing test data...")
 
-        predictions = []
-        unit_ids = []
-
         self.model.eval()
 
-        with torch.no_grad():
-            for unit_id in sorted(df['unit_id'].unique()):
-                engine_data = df[df['unit_id'] == unit_id].sort_values('time_cycles').reset_index(drop=True)
-                max_cycle = engine_data['time_cycles'].max()
-
-                # Extract sensor data
-                sensor_data = engine_data[self.sensor_cols].values
-                rul_column = (max_cycle - engine_data['time_cycles'].values).reshape(-1, 1)
-                sequence_data = np.concatenate([sensor_data, rul_column], axis=1)
-
-                if len(sequence_data) >= self.sequence_length:
-                    last_sequence = sequence_data[-self.sequence_length:]
-                else:
-                    # Pad if sequence is shorter
-                    padding = np.zeros((self.sequence_length - len(sequence_data), sequence_data.shape[1]))
-                    last_sequence = np.concatenate([padding, sequence_data], axis=0)
-
-                # Normalize features
-                features = last_sequence[:, :-1]
-                features_scaled = self.scaler.transform(features)
-                last_sequence_scaled = np.concatenate([features_scaled, last_sequence[:, -1:]], axis=1)
-
-                # Convert to tensor
-                X_pred = torch.from_numpy(last_sequence_scaled).float().unsqueeze(0).to(DEVICE)
-
-                # Predict
-                pred_rul = self.model(X_pred).cpu().numpy()[0, 0]
-                predictions.append(max(0, pred_rul))
-                unit_ids.append(unit_id)
+        # Sort once; each engine is then a contiguous block ending at ends[e]
+        df = df.sort_values(['unit_id', 'time_cycles'], kind='mergesort')
+        grouped = df.groupby('unit_id', sort=False)
+        sizes = grouped.size()
+        unit_ids = list(sizes.index)
+        ends = np.cumsum(sizes.to_numpy()) - 1
+        starts = ends - sizes.to_numpy() + 1
+
+        # Row positions of every engine's last sequence_length cycles, as one
+        # (n_engines, sequence_length) index; positions before the engine's
+        # first row are front padding
+        positions = ends[:, None] + np.arange(1 - self.sequence_length, 1)
+        valid = positions >= starts[:, None]
+        positions = np.where(valid, positions, 0)
+
+        # Gather only those rows' sensors into one (n_engines, sequence_length, F)
+        # batch, zeros where padded
+        last_sequences = df[self.sensor_cols].to_numpy(dtype=np.float32)[positions]
+        last_sequences[~valid] = 0.0
+
+        # One forward pass for all engines, normalized on the device
+        X_pred = self._normalize(torch.from_numpy(last_sequences).to(DEVICE))
+        model = self.model_q if self.model_q is not None and DEVICE.type == 'cpu' else self.model
+        with torch.no_grad(), torch.autocast(device_type=DEVICE.type, dtype=AMP_DTYPE, enabled=USE_AMP):
+            predictions = np.maximum(model(X_pred).float().cpu().numpy()[:, 0], 0)
 
         print(f"🎯 Predicted RUL for {len(unit_ids)} engines")
 
         return {
-            'predictions': np.array(predictions),
+            'predictions': predictions,
             'unit_ids': unit_ids,
             'confidence': np.zeros(len(unit_ids))
         }
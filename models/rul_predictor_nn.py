@@ -20,6 +20,49 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional JIT for the per-engine sensor features; the NumPy / pandas path is used without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _engine_features(sensors, cycles, starts, ends, current, trends, volatility):
+    """
+    Current value, endpoint trend and volatility of every sensor, per engine.
+
+    Engine e is the contiguous, cycle-ordered block [starts[e], ends[e]]. Trends
+    use the raw first/last readings; volatility is the sample std in one
+    Welford pass, skipping NaNs like pandas (0 with fewer than two readings).
+    """
+    n_sensors = sensors.shape[1]
+    for e in prange(len(starts)):
+        start = starts[e]
+        end = ends[e]
+        elapsed = cycles[end] - cycles[start]
+        for j in range(n_sensors):
+            current[e, j] = sensors[end, j]
+            trends[e, j] = (sensors[end, j] - sensors[start, j]) / elapsed if elapsed > 0 else 0.0
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            for pos in range(start, end + 1):
+                v = sensors[pos, j]
+                if v == v:
+                    count += 1
+                    delta = v - mean
+                    mean += delta / count
+                    m2 += delta * (v - mean)
+            volatility[e, j] = np.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+
+
+if NUMBA_AVAILABLE:
+    _engine_features = njit(
+        'void(float64[:, :], float64[:], int64[:], int64[:], float64[:, :], float64[:, :], float64[:, :])',
+        cache=True, parallel=True
+    )(_engine_features)
+
 
 class RULPredictorNN:
     """Neural Network-based RUL predictor"""
@@ -51,6 +94,7 @@ class RULPredictorNN:
         self.scaler = StandardScaler()
         self.is_trained = False
         self.feature_names = []
+        self.sensor_cols = None     # Sensors kept at fit time (not all-NaN)
 
     def engineer_features(self, df: pd.DataFrame, fit: bool = False):
         """
@@ -70,58 +114,71 @@ class RULPredictorNN:
             X: Feature matrix (n_engines, n_features)
             y: RUL values if fit=True, else just X
         """
-        sensor_cols = [col for col in df.columns if col.startswith('sensor_')]
-        sensor_cols = [col for col in sensor_cols if not df[col].isna().all()]
+        if fit or self.sensor_cols is None:
+            # Sensors with any data, found in one vectorized reduction and kept
+            # from fit time so prediction reuses the training layout
+            sensor_cols = [col for col in df.columns if col.startswith('sensor_')]
+            has_data = df[sensor_cols].notna().any()
+            sensor_cols = has_data.index[has_data].tolist()
+            if fit:
+                self.sensor_cols = sensor_cols
+        else:
+            sensor_cols = self.sensor_cols
         op_cols = ['op_setting_1', 'op_setting_2', 'op_setting_3']
 
-        features_list = []
-        rul_list = []
-
-        for unit_id in sorted(df['unit_id'].unique()):
-            engine_data = df[df['unit_id'] == unit_id].sort_values('time_cycles').reset_index(drop=True)
-            last_row = engine_data.iloc[-1]
-            max_cycle = engine_data['time_cycles'].max()
-
+        # Sort once so each engine is a contiguous, cycle-ordered block; per-engine
+        # statistics then come from grouped reductions and first/last positions
+        df = df.sort_values(['unit_id', 'time_cycles'], kind='mergesort')
+        grouped = df.groupby('unit_id', sort=False)
+        sizes = grouped.size().to_numpy()
+        ends = np.cumsum(sizes) - 1
+        starts = ends - sizes + 1
+
+        cycles = df['time_cycles'].to_numpy(dtype=np.float64)
+        sensors = df[sensor_cols].to_numpy(dtype=np.float64)
+        max_cycle = grouped['time_cycles'].max().to_numpy(dtype=np.float64)
+
+        if NUMBA_AVAILABLE:
+            # Current values, trends and volatility in one compiled pass per engine
+            shape = (len(sizes), len(sensor_cols))
+            current_sensors, trends, volatility = np.empty(shape), np.empty(shape), np.empty(shape)
+            _engine_features(np.ascontiguousarray(sensors), cycles,
+                             starts.astype(np.int64), ends.astype(np.int64),
+                             current_sensors, trends, volatility)
+        else:
             # Current sensor values
-            current_sensors = last_row[sensor_cols].values
-
-            # Sensor degradation trends
-            trends = []
-            for col in sensor_cols:
-                if len(engine_data) > 1:
-                    x = engine_data['time_cycles'].values
-                    y = engine_data[col].values
-                    slope = (y[-1] - y[0]) / (x[-1] - x[0]) if (x[-1] - x[0]) > 0 else 0
-                    trends.append(slope)
-                else:
-                    trends.append(0)
+            current_sensors = sensors[ends]
+
+            # Sensor degradation trends (slope from first to last row), one
+            # elementwise divide across every engine and sensor
+            elapsed = cycles[ends] - cycles[starts]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                trends = np.where(
+                    (elapsed > 0)[:, None],
+                    (sensors[ends] - sensors[starts]) / elapsed[:, None],
+                    0.0
+                )
 
             # Sensor volatility
-            volatility = engine_data[sensor_cols].std().fillna(0).values
-
-            # Operational settings
-            op_settings = last_row[op_cols].values
-
-            # Time metrics
-            time_in_op = last_row['time_cycles']
-            time_normalized = time_in_op / max_cycle if max_cycle > 0 else 0
-
-            # Combine all features
-            all_features = np.concatenate([
-                current_sensors,
-                trends,
-                volatility,
-                op_settings,
-                [time_in_op, time_normalized]
-            ])
-
-            features_list.append(all_features)
-
-            if fit:
-                rul = max_cycle - time_in_op
-                rul_list.append(rul)
-
-        X = np.array(features_list)
+            volatility = grouped[sensor_cols].std().fillna(0).to_numpy()
+
+        # Operational settings
+        op_settings = df[op_cols].to_numpy(dtype=np.float64)[ends]
+
+        # Time metrics
+        time_in_op = cycles[ends]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_normalized = np.where(max_cycle > 0, time_in_op / max_cycle, 0.0)
+
+        # Combine all features
+        X = np.column_stack([
+            current_sensors,
+            trends,
+            volatility,
+            op_settings,
+            time_in_op,
+            time_normalized
+        ])
 
         if fit:
             self.feature_names = (
@@ -131,7 +188,7 @@ class RULPredictorNN:
                 op_cols +
                 ["time_in_operation", "time_normalized"]
             )
-            return X, np.array(rul_list)
+            return X, max_cycle - time_in_op
         else:
             return X
 
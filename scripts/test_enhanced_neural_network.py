@@ -0,0 +1,165 @@
+"""
+Tests for the Enhanced Neural Network Cascade Predictor
+=======================================================
+
+Checks the synthetic bootstrap and the prediction paths of
+EnhancedCascadePredictor. The bootstrap cache is redirected to a
+temporary directory so the tests never touch ~/.cache.
+"""
+
+import sys
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import models.enhanced_neural_network as enn
+from models.enhanced_neural_network import EnhancedCascadePredictor
+
+enn.CACHE_DIR = tempfile.mkdtemp(prefix='livewire_test_')
+
+
+def test_bootstrap_keeps_configured_params():
+    """The bootstrap schedule is used for the fit only, fresh or from the cache"""
+    print(f"\n{'='*70}")
+    print("EnhancedCascadePredictor: bootstrap params")
+    print(f"{'='*70}")
+
+    fresh = EnhancedCascadePredictor()
+    cached = EnhancedCascadePredictor()
+    assert os.path.exists(fresh._bootstrap_cache_path())
+    for predictor in (fresh, cached):
+        params = predictor.model.get_params()
+        assert params['max_iter'] == 500
+        assert params['early_stopping'] is True
+        assert predictor.model.n_iter_ <= EnhancedCascadePredictor.BOOTSTRAP_PARAMS['max_iter']
+    assert fresh._bootstrap_cache_path() == cached._bootstrap_cache_path()
+    print("✅ Configured params survive the bootstrap fit")
+
+
+def test_info_and_importance_are_copies():
+    """get_model_info / get_feature_importance return plain dicts the caller owns"""
+    print(f"\n{'='*70}")
+    print("EnhancedCascadePredictor: info and importance")
+    print(f"{'='*70}")
+
+    predictor = EnhancedCascadePredictor()
+    info = predictor.get_model_info()
+    importance = predictor.get_feature_importance()
+    assert type(info) is dict and type(importance) is dict
+    assert list(importance) == EnhancedCascadePredictor.FEATURE_NAMES
+    np.testing.assert_allclose(sum(importance.values()), 1.0)
+
+    info['trained'] = False
+    importance['temperature'] = -1.0
+    assert predictor.get_model_info()['trained'] is True
+    assert predictor.get_feature_importance()['temperature'] >= 0
+    print("✅ Returned dicts are independent copies")
+
+
+def make_readings(n_samples: int = 200, seed: int = 1):
+    """Random sensor reading dicts around the synthetic training distribution"""
+    rng = np.random.default_rng(seed)
+    return [
+        {'temperature': t, 'vibration': v, 'strain': s, 'power': p}
+        for t, v, s, p in zip(rng.normal(45, 15, n_samples), rng.exponential(2, n_samples),
+                              rng.normal(50, 20, n_samples), rng.normal(500, 150, n_samples))
+    ]
+
+
+def sklearn_probabilities(predictor, readings):
+    """Reference class probabilities straight from the scaler and MLPClassifier"""
+    X, _ = predictor.engineer_feature_matrix(readings)
+    return predictor.model.predict_proba(predictor.scaler.transform(X.astype(np.float64)))
+
+
+def test_predictions_follow_refit():
+    """The float32 inference state tracks refits of the underlying MLP"""
+    print(f"\n{'='*70}")
+    print("EnhancedCascadePredictor: refit")
+    print(f"{'='*70}")
+
+    predictor = EnhancedCascadePredictor()
+    readings = make_readings()
+
+    def check():
+        expected = sklearn_probabilities(predictor, readings)
+        batch = predictor.predict_batch(readings)
+        np.testing.assert_allclose([conf for _, conf, _ in batch], expected.max(axis=1), atol=1e-4)
+        _, confidence, _ = predictor.predict_cascade_risk(readings[0])
+        np.testing.assert_allclose(confidence, expected[0].max(), atol=1e-4)
+
+    check()
+    before = predictor.get_feature_importance()
+
+    # Refit in place on relabelled data (new coefs_), then continue it (same coefs_)
+    X, _ = predictor.engineer_feature_matrix(readings)
+    X_scaled = predictor.scaler.transform(X.astype(np.float64))
+    y = np.arange(len(readings)) % 3
+    predictor.model.set_params(max_iter=20, early_stopping=False).fit(X_scaled, y)
+    check()
+    predictor.model.partial_fit(X_scaled, y)
+    check()
+    assert predictor.get_feature_importance() != before
+    print("✅ Predictions match sklearn after fit and partial_fit")
+
+
+def test_concurrent_single_predictions():
+    """predict_cascade_risk from several threads gives the same answers as one thread"""
+    print(f"\n{'='*70}")
+    print("EnhancedCascadePredictor: concurrent predictions")
+    print(f"{'='*70}")
+
+    predictor = EnhancedCascadePredictor()
+    readings = make_readings(n_samples=2000, seed=3)
+    expected = [predictor.predict_cascade_risk(r) for r in readings]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(predictor.predict_cascade_risk, readings))
+    assert results == expected
+    print("✅ Threads do not share scratch buffers")
+
+
+def test_fast_path_follows_model():
+    """Fast-path answers come from the fitted network and are rebuilt after a refit"""
+    print(f"\n{'='*70}")
+    print("EnhancedCascadePredictor: fast path")
+    print(f"{'='*70}")
+
+    predictor = EnhancedCascadePredictor(fast_path=True)
+    rng = np.random.default_rng(2)
+    readings = make_readings() + [
+        {'temperature': t, 'vibration': v, 'strain': s, 'power': p}
+        for t, v, s, p in rng.uniform((10, 0, 0, 200), (30, 1, 30, 800), (100, 4))
+    ]
+
+    def check():
+        expected = sklearn_probabilities(predictor, readings)
+        zones = [EnhancedCascadePredictor.RISK_ZONES[i] for i in expected.argmax(axis=1)]
+        for results in (predictor.predict_batch(readings),
+                        [predictor.predict_cascade_risk(r) for r in readings]):
+            assert [zone for zone, _, _ in results] == zones
+            # A fast-path confidence is the box's least confident network output
+            assert np.all(np.array([conf for _, conf, _ in results]) <= expected.max(axis=1) + 1e-4)
+        return predictor._fast_path_table()
+
+    boxes = check()
+    for _, _, (zone, confidence, _) in boxes:
+        assert confidence >= EnhancedCascadePredictor.FAST_PATH_MIN_CONFIDENCE, zone
+
+    # Refitting on noise labels rebuilds the table from the new weights
+    X, _ = predictor.engineer_feature_matrix(readings)
+    X_scaled = predictor.scaler.transform(X.astype(np.float64))
+    predictor.model.set_params(max_iter=20, early_stopping=False).fit(X_scaled, np.arange(len(readings)) % 3)
+    assert check() is not boxes
+    print(f"✅ {len(boxes)} saturated box(es) on the bootstrap model, rebuilt after refit")
+
+
+if __name__ == "__main__":
+    test_bootstrap_keeps_configured_params()
+    test_info_and_importance_are_copies()
+    test_predictions_follow_refit()
+    test_concurrent_single_predictions()
+    test_fast_path_follows_model()
+
+    print("\n✅ Testing complete!")
@@ -0,0 +1,207 @@
+"""
+Tests for the Optimized Cable Risk Models
+=========================================
+
+Trains the cable risk models on small synthetic sensor data and checks
+their train / predict round trips.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import models.optimized_cable_models as cable_models
+from models.optimized_cable_models import (
+    EnsembleVotingClassifier, EnhancedNeuralNetwork, OptimizedRandomForest,
+    OptimizedGradientBoosting, OptimizedSVM, AutoTunedModel
+)
+
+
+def make_sensor_data(n_samples: int = 300, seed: int = 0):
+    """
+    Synthetic cable readings labelled green/yellow/red by a stress threshold.
+
+    Returns:
+        (DataFrame of the four sensors, array of risk zone labels)
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'temperature': rng.normal(45, 12, n_samples),
+        'vibration': rng.exponential(1.5, n_samples),
+        'strain': rng.normal(400, 150, n_samples),
+        'power': rng.normal(1100, 300, n_samples),
+    })
+    stress = df['temperature'] / 70 + df['vibration'] / 5 + df['strain'] / 800
+    y = np.where(stress > 1.8, 'red', np.where(stress > 1.3, 'yellow', 'green'))
+    return df, y
+
+
+def test_ensemble_train_predict():
+    """The voting ensemble trains and predicts batches and single readings"""
+    print(f"\n{'='*70}")
+    print("Ensemble Voting Classifier: train / predict")
+    print(f"{'='*70}")
+
+    df, y = make_sensor_data()
+    model = EnsembleVotingClassifier()
+    model.train(df, y)
+
+    predictions, probabilities = model.predict(df)
+    assert predictions.shape == (len(df),)
+    assert probabilities.shape == (len(df), 3)
+    assert set(predictions) <= set(y)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0, rtol=1e-6)
+    assert model.model.n_features_in_ == 18
+    # VotingClassifier fits clones; the configured estimators stay unfitted templates
+    assert list(model.model.named_estimators_) == [name for name, _ in model.model.estimators]
+    assert not hasattr(model.model.estimators[0][1], 'classes_')
+
+    prediction, proba = model.predict(df.iloc[0].to_dict())
+    assert prediction == predictions[0]
+    np.testing.assert_allclose(proba, probabilities[0], rtol=1e-4, atol=1e-6)
+
+    accuracy = np.mean(predictions == y)
+    print(f"✅ Training accuracy: {accuracy:.3f}")
+
+
+def test_feature_dtype_per_model():
+    """Only the tree models get float32 features; batch and single readings agree"""
+    print(f"\n{'='*70}")
+    print("Scaled feature dtype")
+    print(f"{'='*70}")
+
+    df, y = make_sensor_data()
+    expected = [
+        (OptimizedRandomForest(), np.float32),
+        (OptimizedGradientBoosting(), np.float32),
+        (EnhancedNeuralNetwork(), np.float64),
+        (OptimizedSVM('rbf'), np.float64),
+        (OptimizedSVM('linear'), np.float64),
+    ]
+    assert AutoTunedModel('random_forest').feature_dtype == np.float32
+    assert AutoTunedModel('neural_network').feature_dtype == np.float64
+
+    for model, dtype in expected:
+        model.train(df, y)
+        X_batch = model._predict_features(df)
+        X_single = model._predict_features(df.iloc[0].to_dict())
+        assert X_batch.dtype == dtype and X_single.dtype == dtype, model.model_name
+        np.testing.assert_allclose(X_batch[0], X_single[0], rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(X_batch, model._scale_features(model.engineer_features(df)),
+                                   rtol=1e-5, atol=1e-6)
+        print(f"✅ {model.model_name:35s}: {np.dtype(dtype).name}")
+
+
+def test_feature_kernels_match_fallback():
+    """The compiled feature kernels equal engineer_features and the NumPy batch path"""
+    print(f"\n{'='*70}")
+    print("Feature kernels vs fallback")
+    print(f"{'='*70}")
+
+    df, y = make_sensor_data(n_samples=100)
+    model = OptimizedGradientBoosting()
+    model.train(df, y)
+
+    X_expected = model.engineer_features(df)
+    out = np.empty(18)
+    for i, reading in enumerate(df.to_dict('records')):
+        cable_models._cable_features(reading['temperature'], reading['vibration'],
+                                     reading['strain'], reading['power'], out)
+        np.testing.assert_allclose(out, X_expected[i], rtol=1e-12)
+        np.testing.assert_allclose(model.engineer_features(reading)[0], X_expected[i], rtol=1e-12)
+
+    X_fused = model._predict_features(df)
+    with mock.patch.object(cable_models, 'NUMBA_AVAILABLE', False):
+        X_fallback = model._predict_features(df)
+    np.testing.assert_allclose(X_fused, X_fallback, rtol=1e-5, atol=1e-6)
+    print(f"✅ Kernels match (numba {'on' if cable_models.NUMBA_AVAILABLE else 'not installed'})")
+
+
+def test_predict_fast_matches_predict():
+    """predict_fast on a forest equals sklearn's predict_proba on the same reading"""
+    print(f"\n{'='*70}")
+    print("Random forest predict_fast")
+    print(f"{'='*70}")
+
+    df, y = make_sensor_data()
+    model = OptimizedRandomForest()
+    model.train(df, y)
+    _, batch_probabilities = model.predict(df)
+
+    for i, reading in enumerate(df.head(50).to_dict('records')):
+        prediction, proba = model.predict_fast(reading['temperature'], reading['vibration'],
+                                               reading['strain'], reading['power'])
+        X = model._scale_features(model.engineer_features(reading))
+        expected = model.model.predict_proba(X)[0]
+        np.testing.assert_allclose(proba, expected, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(proba, batch_probabilities[i], rtol=1e-6, atol=1e-9)
+        assert prediction == model.model.classes_[np.argmax(expected)]
+        assert model.predict(reading)[0] == prediction
+
+    # A refit must rebuild the flattened forest
+    model.train(df, np.roll(y, 1))
+    _, proba = model.predict_fast(**{k: df.iloc[0][k] for k in
+                                      ('temperature', 'vibration', 'strain', 'power')})
+    X = model._scale_features(model.engineer_features(df.iloc[0].to_dict()))
+    np.testing.assert_allclose(proba, model.model.predict_proba(X)[0], rtol=1e-9, atol=1e-12)
+    print(f"✅ predict_fast matches (numba {'on' if cable_models.NUMBA_AVAILABLE else 'not installed'})")
+
+
+def test_onnx_predict_matches_sklearn():
+    """The ONNX Runtime MLP gives sklearn's probabilities, as float64"""
+    print(f"\n{'='*70}")
+    print("Enhanced Neural Network: ONNX Runtime inference")
+    print(f"{'='*70}")
+
+    if not cable_models.ONNX_AVAILABLE:
+        print("⏭️  Skipped: onnxruntime / skl2onnx not installed")
+        return
+
+    df, y = make_sensor_data()
+    model = EnhancedNeuralNetwork()
+    model.train(df, y)
+    assert model._ort_session is not None
+
+    predictions, probabilities = model.predict(df)
+    expected = model.model.predict_proba(model._predict_features(df))
+    assert probabilities.dtype == np.float64
+    np.testing.assert_allclose(probabilities, expected, atol=1e-5)
+    assert np.mean(predictions == model.model.classes_[expected.argmax(axis=1)]) > 0.99
+
+    _, proba = model.predict(df.iloc[0].to_dict())
+    assert proba.dtype == np.float64
+    np.testing.assert_allclose(proba, expected[0], atol=1e-5)
+    print(f"✅ Max |ORT - sklearn| = {np.abs(probabilities - expected).max():.2e}")
+
+
+def test_train_on_shared_features():
+    """Training on a precomputed feature matrix equals training on the raw frame"""
+    print(f"\n{'='*70}")
+    print("Shared feature matrix")
+    print(f"{'='*70}")
+
+    df, y = make_sensor_data()
+    X_features = OptimizedRandomForest().engineer_features(df)
+    X_copy = X_features.copy()
+    for make in (OptimizedGradientBoosting, EnsembleVotingClassifier):
+        own, shared = make(), make()
+        own.train(df, y)
+        shared.train(df, y, X_features=X_features)
+        np.testing.assert_allclose(shared.predict(df)[1], own.predict(df)[1], rtol=1e-9)
+        np.testing.assert_array_equal(X_features, X_copy)  # Shared matrix is left untouched
+        print(f"✅ {own.model_name}: same model from the shared matrix")
+
+
+if __name__ == "__main__":
+    test_ensemble_train_predict()
+    test_feature_dtype_per_model()
+    test_feature_kernels_match_fallback()
+    test_predict_fast_matches_predict()
+    test_onnx_predict_matches_sklearn()
+    test_train_on_shared_features()
+
+    print("\n✅ Testing complete!")